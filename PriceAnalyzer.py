@@ -15,7 +15,187 @@ import json
 import os
 import pickle
 from datetime import datetime
-import random
+import threading
+import functools
+import time
+
+try:
+    import numba
+except ImportError:  # Optional: only speeds up large synthetic data generation
+    numba = None
+
+
+# Market rate lookup tables, indexed by _MARKET_CATEGORY_INDEX / _MARKET_LOCATION_INDEX
+_MARKET_CATEGORIES = [
+    'Masonry',              # Bricklaying, plastering, concrete work
+    'Carpentry',            # Woodwork, door/window installation
+    'Plumbing',             # Water supply systems, drainage
+    'Electrical',           # Wiring, electrical installations
+    'Painting',             # Interior/exterior painting
+    'Tiling',               # Floor/wall tiling
+    'Roofing',              # Roof installation and repair
+    'Foundation Work',      # Excavation, foundation laying
+    'Interior Design',      # Interior planning and decoration
+    'Landscaping',          # Garden design, outdoor structures
+    'HVAC',                 # Heating, ventilation, air conditioning
+    'General Contracting'   # Overall project management
+]
+
+# Base rates for different categories (in LKR per day)
+_BASE_RATES = np.array([
+    3200, 3800, 4200, 4500, 3000, 3400, 4200, 5500, 7500, 3600, 6000, 5000
+])
+
+# Material cost adjustment (percentage of material costs in total price)
+_MATERIAL_PCT = np.array([
+    0.65, 0.60, 0.55, 0.60, 0.50, 0.70, 0.75, 0.70, 0.50, 0.55, 0.65, 0.60
+])
+
+# Location adjustment factors (based on cost of living differences)
+_MARKET_LOCATIONS = [
+    'Colombo',       # Capital city, highest costs
+    'Gampaha',       # Western province, urban
+    'Kandy',         # Central province, urban
+    'Galle',         # Southern province, tourist area
+    'Negombo',       # Western coastal city
+    'Jaffna',        # Northern province capital
+    'Anuradhapura',  # North Central province
+    'Batticaloa',    # Eastern province
+    'Trincomalee',   # Eastern coastal city
+    'Matara',        # Southern coastal city
+    'Kurunegala',    # North Western province
+    'Ratnapura',     # Sabaragamuwa province
+    'Badulla',       # Uva province
+    'Nuwara Eliya',  # Central highlands, tourist area
+    'Hambantota',    # Southern development zone
+    'Kalmunai',      # Eastern coastal town
+    'Vavuniya',      # Northern inland city
+    'Matale',        # Central province
+    'Puttalam',      # North Western coastal city
+    'Kegalle'        # Sabaragamuwa province
+]
+_LOC_FACTORS = np.array([
+    1.35, 1.25, 1.20, 1.15, 1.20, 1.10, 0.95, 0.90, 0.92, 1.05,
+    0.98, 0.95, 0.92, 1.10, 1.05, 0.88, 0.90, 0.95, 0.90, 0.92
+])
+
+_MARKET_CATEGORY_INDEX = {cat: idx for idx, cat in enumerate(_MARKET_CATEGORIES)}
+_MARKET_LOCATION_INDEX = {loc: idx for idx, loc in enumerate(_MARKET_LOCATIONS)}
+
+# Defaults used when a category or location is not in the tables
+_DEFAULT_BASE_RATE = 4000
+_DEFAULT_LOC_FACTOR = 1.0
+_DEFAULT_MATERIAL_PCT = 0.60
+
+_MATERIAL_COST_TRENDS = np.array(['Stable', 'Rising', 'Falling'])
+
+def _select_precision_policy():
+    """
+    Pick a mixed precision policy for the available hardware
+
+    Only the name is returned; _build_model passes it to its own layers, so
+    the process-wide Keras policy is left alone for other importers.
+
+    Returns:
+        Name of the Keras dtype policy for the model's hidden layers
+    """
+    gpus = tf.config.list_physical_devices('GPU')
+    if not gpus:
+        # CPU inference/training stays in FP32
+        return 'float32'
+
+    # BF16 needs Ampere (compute capability 8.0) or newer
+    details = tf.config.experimental.get_device_details(gpus[0])
+    if details.get('compute_capability', (0, 0)) >= (8, 0):
+        return 'mixed_bfloat16'
+    return 'mixed_float16'
+
+
+_PRECISION_POLICY = _select_precision_policy()
+
+
+# Below this many samples Numba's compile time outweighs the fused kernel
+_NUMBA_MIN_SAMPLES = 100_000
+
+
+def _synth_prices_kernel(cat_idx, loc_idx, base_rates, loc_factors, area_impact,
+                         area_sqm, complexity_score, material_quality_score,
+                         seasonal_effect, noise):
+    """Compute synthetic prices in one fused pass over the samples"""
+    n = cat_idx.shape[0]
+    price = np.empty(n, dtype=np.float64)
+    for i in _prange(n):
+        base_price = base_rates[cat_idx[i]]
+        area_effect = area_impact[cat_idx[i]] * area_sqm[i] ** 0.85
+        complexity_effect = base_price * (complexity_score[i] / 5 - 1) * 0.25
+        material_effect = base_price * (material_quality_score[i] / 5 - 1) * 0.35
+        p = (base_price + area_effect + complexity_effect + material_effect) * \
+            loc_factors[loc_idx[i]] * seasonal_effect[i] * noise[i]
+        price[i] = max(1.0, np.rint(p))
+    return price
+
+
+if numba is not None:
+    _prange = numba.prange
+    _synth_prices_kernel = numba.njit(
+        parallel=True, fastmath=True, cache=True)(_synth_prices_kernel)
+else:
+    _prange = range
+
+
+def _row_stats_kernel(values):
+    """Per-row mean/min/max of a 2D array in a single pass"""
+    n_rows, n_cols = values.shape
+    means = np.empty(n_rows, dtype=np.float64)
+    mins = np.empty(n_rows, dtype=np.float64)
+    maxs = np.empty(n_rows, dtype=np.float64)
+    for i in range(n_rows):
+        total = 0.0
+        mn = values[i, 0]
+        mx = mn
+        for j in range(n_cols):
+            v = values[i, j]
+            total += v
+            mn = min(mn, v)
+            mx = max(mx, v)
+        means[i] = total / n_cols
+        mins[i] = mn
+        maxs[i] = mx
+    return means, mins, maxs
+
+
+def _row_stats(values):
+    """Per-row mean/min/max, via the Numba kernel when available"""
+    if numba is not None:
+        return _row_stats_kernel(values)
+    return values.mean(axis=1), values.min(axis=1), values.max(axis=1)
+
+
+if numba is not None:
+    _row_stats_kernel = numba.njit(cache=True)(_row_stats_kernel)
+
+
+def _mlp_forward_kernel(X, W0, b0, W1, b1, W2, b2, W3, b3):
+    """Forward pass of the folded 3-hidden-layer ReLU MLP on unscaled features"""
+    h = np.maximum(X @ W0 + b0, np.float32(0.0))
+    h = np.maximum(h @ W1 + b1, np.float32(0.0))
+    h = np.maximum(h @ W2 + b2, np.float32(0.0))
+    return h @ W3 + b3
+
+
+if numba is not None:
+    _mlp_forward_kernel = numba.njit(
+        fastmath=True, cache=True, nogil=True)(_mlp_forward_kernel)
+
+
+# Decimal places numeric prediction inputs are rounded to on every path
+_INPUT_DECIMALS = 1
+
+
+@functools.lru_cache(maxsize=1)
+def _today(epoch_seconds):
+    """Format the current date, cached per second so loops don't re-run strftime"""
+    return datetime.fromtimestamp(epoch_seconds).strftime("%Y-%m-%d")
 
 
 class PriceAnalyzer:
@@ -32,9 +212,32 @@ class PriceAnalyzer:
             model_path: Path to saved TensorFlow model (optional)
         """
         self.model = None
+        self._keras_model_path = None
+        self._saved_model = None
         self.scaler = StandardScaler()
+        self._scale_mean = None
+        self._scale_inv_std = None
         self.category_mapping = {}
         self.location_mapping = {}
+        self._category_dtype = None
+        self._location_dtype = None
+        self._default_category_id = None
+        self._default_location_id = None
+        self._categories = np.empty(0, dtype=object)
+        self._category_ids = np.empty(0, dtype=np.int32)
+        self._locations = np.empty(0, dtype=object)
+        self._location_ids = np.empty(0, dtype=np.int32)
+        self._tflite_interpreter = None
+        self._tflite_lock = threading.Lock()
+        self._mlp_params = None
+        self._rng = np.random.default_rng()
+
+        # Memoized predictions (cleared whenever the model changes) and
+        # market rates (kept stable for a calendar day)
+        self._predict_cache = functools.lru_cache(maxsize=16384)(
+            self._compute_fair_price)
+        self._market_rates_cache = functools.lru_cache(maxsize=4096)(
+            self._compute_market_rates)
 
         # Load model if path is provided
         if model_path and os.path.exists(model_path):
@@ -53,23 +256,55 @@ class PriceAnalyzer:
         """Build the TensorFlow model for price prediction"""
 
         # Define a simple neural network architecture
+        policy = _PRECISION_POLICY
         model = tf.keras.Sequential([
-            tf.keras.layers.Dense(64, activation='relu', input_shape=(5,)),
-            tf.keras.layers.BatchNormalization(),
-            tf.keras.layers.Dense(32, activation='relu'),
-            tf.keras.layers.Dropout(0.2),
-            tf.keras.layers.Dense(16, activation='relu'),
-            tf.keras.layers.Dense(1)  # Output layer (predicted fair price)
+            tf.keras.layers.Dense(64, activation='relu', input_shape=(5,),
+                                  dtype=policy),
+            tf.keras.layers.BatchNormalization(dtype=policy),
+            tf.keras.layers.Dense(32, activation='relu', dtype=policy),
+            tf.keras.layers.Dropout(0.2, dtype=policy),
+            tf.keras.layers.Dense(16, activation='relu', dtype=policy),
+            # Output layer (predicted fair price), kept in FP32 for numerical safety
+            tf.keras.layers.Dense(1, dtype='float32')
         ])
 
+        # FP16 gradients need loss scaling to avoid underflow
+        optimizer = tf.keras.optimizers.Adam(learning_rate=0.001)
+        if policy == 'mixed_float16':
+            optimizer = tf.keras.mixed_precision.LossScaleOptimizer(optimizer)
+
         # Compile the model
         model.compile(
-            optimizer=tf.keras.optimizers.Adam(learning_rate=0.001),
+            optimizer=optimizer,
             loss='mean_squared_error',
             metrics=['mae']
         )
 
         self.model = model
+        self._build_inference_fn()
+
+    def _build_inference_fn(self):
+        """Wrap the model in traced tf.functions so inference skips Keras predict"""
+        model = self.model
+
+        # Single-row path for predict_fair_price when the folded MLP kernel
+        # isn't available. Its shape is fixed, so XLA compiles it exactly once
+        # into a single fused kernel, on first use: with the folded kernel in
+        # place it never runs, and warm_up triggers it when it is the active path
+        self._infer_one = tf.function(
+            lambda x: model(x, training=False),
+            input_signature=[tf.TensorSpec(shape=(1, 5), dtype=tf.float32)],
+            jit_compile=True
+        )
+
+        # Batched path (all locations, evaluation sets)
+        self._infer_many = tf.function(
+            lambda x: model(x, training=False),
+            input_signature=[tf.TensorSpec(shape=(None, 5), dtype=tf.float32)]
+        )
+
+        # Trace the batched path up front; evaluate_model always uses it
+        self._infer_many(tf.zeros((1, 5), dtype=tf.float32))
 
     def load_model(self, model_path):
         """
@@ -78,48 +313,225 @@ class PriceAnalyzer:
         Args:
             model_path: Path to saved TensorFlow model
         """
-        self.model = tf.keras.models.load_model(model_path)
+        model_dir = os.path.dirname(model_path)
+        self._predict_cache.cache_clear()
+
+        # Prefer the exported SavedModel for inference; the Keras model is only
+        # reconstructed if something needs to train or re-save it
+        saved_model_path = model_path + '_sm'
+        if os.path.isdir(saved_model_path):
+            # Keep the loaded object alive, it owns the variables
+            self._saved_model = tf.saved_model.load(saved_model_path)
+            self._infer_one = self._saved_model.infer_one
+            self._infer_many = self._saved_model.infer_many
+            self.model = None
+            self._keras_model_path = model_path
+        else:
+            self.model = tf.keras.models.load_model(model_path)
+            self._build_inference_fn()
 
         # Load feature mappings
-        mappings_path = os.path.join(os.path.dirname(
-            model_path), 'feature_mappings.json')
+        mappings_path = os.path.join(model_dir, 'feature_mappings.json')
         if os.path.exists(mappings_path):
             with open(mappings_path, 'r') as f:
                 mappings = json.load(f)
                 self.category_mapping = mappings['category']
                 self.location_mapping = mappings['location']
+            self._refresh_feature_dtypes()
 
-        # Load scaler
-        scaler_path = os.path.join(os.path.dirname(model_path), 'scaler.pkl')
+        # Load scaler (fall back to the older pickled StandardScaler)
+        scaler_path = os.path.join(model_dir, 'scaler.npz')
+        legacy_scaler_path = os.path.join(model_dir, 'scaler.pkl')
         if os.path.exists(scaler_path):
-            with open(scaler_path, 'rb') as f:
+            with np.load(scaler_path) as params:
+                self.scaler = StandardScaler()
+                self.scaler.mean_ = params['mean']
+                self.scaler.scale_ = params['scale']
+                self.scaler.var_ = params['var']
+                self.scaler.n_features_in_ = params['mean'].shape[0]
+                self.scaler.n_samples_seen_ = int(params['n_samples_seen'])
+            self._refresh_scaler_cache()
+        elif os.path.exists(legacy_scaler_path):
+            with open(legacy_scaler_path, 'rb') as f:
                 self.scaler = pickle.load(f)
+            self._refresh_scaler_cache()
+
+        # Load INT8 TFLite model for CPU inference if one was exported
+        tflite_path = os.path.join(model_dir, 'model.tflite')
+        if os.path.exists(tflite_path):
+            with open(tflite_path, 'rb') as f:
+                self._tflite_interpreter = tf.lite.Interpreter(
+                    model_content=f.read(), num_threads=os.cpu_count())
+            self._tflite_interpreter.allocate_tensors()
+            self._refresh_tflite_quant_cache()
+
+        # Folded MLP weights; the SavedModel-only path can't rebuild them
+        # from Keras layers, so they are read from the export when present
+        mlp_path = os.path.join(model_dir, 'mlp_weights.npz')
+        if self.model is not None:
+            self._refresh_mlp_params()
+        elif os.path.exists(mlp_path):
+            with np.load(mlp_path) as params:
+                self._mlp_params = tuple(
+                    params[f'arr_{i}'] for i in range(len(params.files)))
+        else:
+            self._mlp_params = None
+
+
+    def _ensure_keras_model(self):
+        """Load the full Keras model if only the SavedModel inference handle was loaded"""
+        if self.model is None and self._keras_model_path is not None:
+            self.model = tf.keras.models.load_model(self._keras_model_path)
+            self._build_inference_fn()
 
-    def save_model(self, model_path):
+    def save_model(self, model_path, export_tflite=False):
         """
         Save the trained model to disk
 
         Args:
             model_path: Path where to save the model
+            export_tflite: Also write the INT8 TFLite model even when the folded
+                           MLP weights (which take precedence) are saved
         """
-        if not os.path.exists(os.path.dirname(model_path)):
-            os.makedirs(os.path.dirname(model_path))
+        model_dir = os.path.dirname(model_path) or '.'
+        os.makedirs(model_dir, exist_ok=True)
 
+        self._ensure_keras_model()
         self.model.save(model_path)
 
+        # Save the traced inference functions as a SavedModel for fast loading
+        export = tf.Module()
+        export.model = self.model
+        export.infer_one = self._infer_one
+        export.infer_many = self._infer_many
+        tf.saved_model.save(export, model_path + '_sm')
+
         # Save feature mappings
-        mappings_path = os.path.join(os.path.dirname(
-            model_path), 'feature_mappings.json')
+        mappings_path = os.path.join(model_dir, 'feature_mappings.json')
         with open(mappings_path, 'w') as f:
             json.dump({
                 'category': self.category_mapping,
                 'location': self.location_mapping
             }, f)
 
-        # Save scaler
-        scaler_path = os.path.join(os.path.dirname(model_path), 'scaler.pkl')
-        with open(scaler_path, 'wb') as f:
-            pickle.dump(self.scaler, f)
+        # Save scaler parameters
+        scaler_path = os.path.join(model_dir, 'scaler.npz')
+        np.savez(
+            scaler_path,
+            mean=self.scaler.mean_,
+            scale=self.scaler.scale_,
+            var=self.scaler.var_,
+            n_samples_seen=self.scaler.n_samples_seen_
+        )
+
+        # Save the folded MLP weights used for CPU inference. Without them,
+        # remove any earlier export's file so load_model doesn't pair stale
+        # weights with this SavedModel
+        mlp_path = os.path.join(model_dir, 'mlp_weights.npz')
+        if self._mlp_params is not None:
+            np.savez(mlp_path, *self._mlp_params)
+        elif os.path.exists(mlp_path):
+            os.remove(mlp_path)
+
+        # Save the INT8 TFLite model for CPU inference. Calibrating it is slow
+        # and it is only used without folded weights, so it is skipped unless
+        # it would be used or was asked for; a stale export is removed
+        tflite_path = os.path.join(model_dir, 'model.tflite')
+        if export_tflite or self._mlp_params is None:
+            with open(tflite_path, 'wb') as f:
+                f.write(self._convert_to_tflite())
+        elif os.path.exists(tflite_path):
+            os.remove(tflite_path)
+
+    def _convert_to_tflite(self, num_samples=100):
+        """
+        Convert the Keras model to a fully INT8-quantized TFLite model
+
+        Args:
+            num_samples: Number of synthetic rows used to calibrate quantization ranges
+
+        Returns:
+            Serialized TFLite model bytes
+        """
+        sample = self.generate_training_data(size=num_samples)
+        X_sample = self._prepare_features(sample)
+        X_sample = X_sample[(X_sample[:, :2] >= 0).all(axis=1)]
+        X_sample = ((X_sample - self._scale_mean) *
+                    self._scale_inv_std).astype(np.float32)
+
+        def representative_dataset():
+            for i in range(len(X_sample)):
+                yield [X_sample[i:i + 1]]
+
+        converter = tf.lite.TFLiteConverter.from_keras_model(self.model)
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        converter.representative_dataset = representative_dataset
+        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+        converter.inference_input_type = tf.int8
+
+        return converter.convert()
+
+    def _refresh_tflite_quant_cache(self):
+        """
+        Cache the interpreter's tensor details and fold feature scaling and INT8
+        input quantization into a single per-column multiply-add
+        """
+        interpreter = self._tflite_interpreter
+        input_details = interpreter.get_input_details()[0]
+        output_details = interpreter.get_output_details()[0]
+
+        self._tflite_input_index = input_details['index']
+        self._tflite_input_dtype = input_details['dtype']
+        self._tflite_input_shape = tuple(input_details['shape'])
+        self._tflite_output_index = output_details['index']
+        self._tflite_output_dtype = output_details['dtype']
+        self._tflite_output_quant = output_details['quantization']
+
+        # q = (x - mean) * inv_std / scale + zero_point = x * mul + add
+        mul = self._scale_inv_std
+        add = -self._scale_mean * self._scale_inv_std
+        if self._tflite_input_dtype == np.int8:
+            scale, zero_point = input_details['quantization']
+            mul = mul / scale
+            add = add / scale + zero_point
+        self._tflite_input_mul = mul.astype(np.float32)
+        self._tflite_input_add = add.astype(np.float32)
+
+    def _predict_tflite(self, X):
+        """
+        Run raw (unscaled) features through the TFLite interpreter
+
+        Args:
+            X: Feature matrix of shape (n, 5) as built by _prepare_features
+
+        Returns:
+            Numpy array of predictions with shape (n, 1)
+        """
+        interpreter = self._tflite_interpreter
+
+        # Scale and quantize into the interpreter's input domain in one pass
+        X_input = X * self._tflite_input_mul + self._tflite_input_add
+        if self._tflite_input_dtype == np.int8:
+            X_input = np.clip(np.round(X_input), -128, 127)
+        X_input = X_input.astype(self._tflite_input_dtype)
+
+        # The interpreter is stateful, so serialize access across request threads
+        with self._tflite_lock:
+            if self._tflite_input_shape != X_input.shape:
+                interpreter.resize_tensor_input(
+                    self._tflite_input_index, X_input.shape)
+                interpreter.allocate_tensors()
+                self._tflite_input_shape = X_input.shape
+            interpreter.set_tensor(self._tflite_input_index, X_input)
+            interpreter.invoke()
+            output = interpreter.get_tensor(self._tflite_output_index)
+
+        # Dequantize outputs if the model emits integers
+        if self._tflite_output_dtype == np.int8:
+            scale, zero_point = self._tflite_output_quant
+            output = (output.astype(np.float32) - zero_point) * scale
+
+        return output
 
     def train(self, data, epochs=50, batch_size=32, validation_split=0.2):
         """
@@ -135,6 +547,8 @@ class PriceAnalyzer:
         Returns:
             Training history
         """
+        self._ensure_keras_model()
+
         # Create category and location mappings
         categories = data['category'].unique()
         locations = data['location'].unique()
@@ -142,25 +556,133 @@ class PriceAnalyzer:
         self.category_mapping = {
             cat: idx for idx, cat in enumerate(categories)}
         self.location_mapping = {loc: idx for idx, loc in enumerate(locations)}
+        self._refresh_feature_dtypes()
 
         # Prepare features
         X = self._prepare_features(data)
-        y = data['price'].values
+        y = data['price'].to_numpy(dtype=np.float32)
+
+        # Scale features (inline, so the matrix stays float32)
+        self.scaler.fit(X)
+        self._refresh_scaler_cache()
+        X_scaled = (X - self._scale_mean) * self._scale_inv_std
 
-        # Scale features
-        X_scaled = self.scaler.fit_transform(X)
+        # Hold out the last rows for validation, as Keras' validation_split does
+        split_at = int(len(y) * (1 - validation_split))
+        train_ds = self._make_dataset(
+            X_scaled[:split_at], y[:split_at], batch_size, shuffle=True)
+        val_ds = self._make_dataset(
+            X_scaled[split_at:], y[split_at:], batch_size, shuffle=False) \
+            if split_at < len(y) else None
 
         # Train the model
         history = self.model.fit(
-            X_scaled, y,
+            train_ds,
             epochs=epochs,
-            batch_size=batch_size,
-            validation_split=validation_split,
+            validation_data=val_ds,
+            shuffle=False,  # The dataset already reshuffles each epoch
             verbose=1
         )
 
+        # Any exported TFLite model and cached prediction no longer match the
+        # updated weights
+        self._tflite_interpreter = None
+        self._predict_cache.cache_clear()
+        self._refresh_mlp_params()
+
         return history
 
+    def _make_dataset(self, X, y, batch_size, shuffle):
+        """
+        Build a cached, prefetching tf.data pipeline for model.fit
+
+        Args:
+            X: Scaled feature matrix
+            y: Target prices
+            batch_size: Training batch size
+            shuffle: Whether to reshuffle the rows every epoch
+
+        Returns:
+            Batched tf.data.Dataset of (features, price) pairs
+        """
+        dataset = tf.data.Dataset.from_tensor_slices(
+            (X.astype(np.float32, copy=False),
+             y.astype(np.float32, copy=False))).cache()
+        if shuffle:
+            dataset = dataset.shuffle(len(y), reshuffle_each_iteration=True)
+
+        # Keep training batch shapes static unless that would drop every row;
+        # validation keeps its last partial batch so every row is scored
+        dataset = dataset.batch(
+            batch_size, drop_remainder=shuffle and len(y) >= batch_size)
+
+        return dataset.prefetch(tf.data.AUTOTUNE)
+
+    def _refresh_mlp_params(self):
+        """
+        Extract the Keras weights into plain float32 arrays for _mlp_forward_kernel
+
+        The input scaler is folded into the first layer and the inference-mode
+        BatchNormalization into the layer after it, so the kernel runs on raw
+        features. Left as None (falling back to TensorFlow) if the model isn't
+        the expected Dense/BatchNorm/Dropout stack.
+        """
+        self._mlp_params = None
+        if self.model is None or self._scale_mean is None:
+            return
+
+        # Affine transform (scale, shift) still to be applied to the next
+        # Dense layer's input: starts as the StandardScaler
+        in_scale = self._scale_inv_std.ravel().astype(np.float64)
+        in_shift = -self._scale_mean.ravel().astype(np.float64) * in_scale
+        params = []
+        activations = []
+        for layer in self.model.layers:
+            if isinstance(layer, tf.keras.layers.Dense):
+                W, b = (w.astype(np.float64) for w in layer.get_weights())
+                params.append((in_scale[:, None] * W).astype(np.float32))
+                params.append((b + in_shift @ W).astype(np.float32))
+                activations.append(tf.keras.activations.serialize(layer.activation))
+                in_scale = np.ones(W.shape[1])
+                in_shift = np.zeros(W.shape[1])
+            elif isinstance(layer, tf.keras.layers.BatchNormalization):
+                gamma, beta, mean, var = (w.astype(np.float64) for w in layer.get_weights())
+                bn_scale = gamma / np.sqrt(var + layer.epsilon)
+                in_shift = (in_shift - mean) * bn_scale + beta
+                in_scale = in_scale * bn_scale
+            elif not isinstance(layer, tf.keras.layers.Dropout):
+                return
+
+        if activations != ['relu', 'relu', 'relu', 'linear']:
+            return
+        self._mlp_params = tuple(params)
+
+    def _refresh_scaler_cache(self):
+        """Cache the fitted scaler parameters as float32 arrays for inline scaling"""
+        self._scale_mean = self.scaler.mean_.astype(np.float32)
+        self._scale_inv_std = (1 / self.scaler.scale_).astype(np.float32)
+
+    def _refresh_feature_dtypes(self):
+        """Build categorical dtypes whose codes match the category / location mappings"""
+        self._category_dtype = pd.CategoricalDtype(
+            sorted(self.category_mapping, key=self.category_mapping.get))
+        self._location_dtype = pd.CategoricalDtype(
+            sorted(self.location_mapping, key=self.location_mapping.get))
+
+        # Ids substituted for unknown labels (the first entry of each mapping)
+        self._default_category_id = next(iter(self.category_mapping.values()), None)
+        self._default_location_id = next(iter(self.location_mapping.values()), None)
+
+        # Label and id arrays for enumerating every category / location
+        self._categories = np.array(list(self.category_mapping), dtype=object)
+        self._category_ids = np.fromiter(
+            self.category_mapping.values(), dtype=np.int32,
+            count=len(self.category_mapping))
+        self._locations = np.array(list(self.location_mapping), dtype=object)
+        self._location_ids = np.fromiter(
+            self.location_mapping.values(), dtype=np.int32,
+            count=len(self.location_mapping))
+
     def _prepare_features(self, data):
         """
         Prepare features for the model
@@ -171,18 +693,20 @@ class PriceAnalyzer:
         Returns:
             Numpy array of processed features
         """
-        # Convert categories and locations to numeric
-        category_numeric = data['category'].map(self.category_mapping).values
-        location_numeric = data['location'].map(self.location_mapping).values
+        # Convert categories and locations to numeric (unseen labels become -1)
+        category_numeric = data['category'].astype(
+            self._category_dtype).cat.codes.to_numpy()
+        location_numeric = data['location'].astype(
+            self._location_dtype).cat.codes.to_numpy()
 
         # Create feature matrix
-        X = np.column_stack([
+        X = np.column_stack((
             category_numeric,
             location_numeric,
-            data['area_sqm'].values,
-            data['complexity_score'].values,
-            data['material_quality_score'].values
-        ])
+            data['area_sqm'].to_numpy(),
+            data['complexity_score'].to_numpy(),
+            data['material_quality_score'].to_numpy()
+        )).astype(np.float32, copy=False)
 
         return X
 
@@ -200,35 +724,113 @@ class PriceAnalyzer:
         Returns:
             Predicted fair price
         """
-        # Handle unknown categories or locations
-        if category not in self.category_mapping:
-            category = list(self.category_mapping.keys())[
-                0]  # Use first category as default
-
-        if location not in self.location_mapping:
-            location = list(self.location_mapping.keys())[
-                0]  # Use first location as default
+        # Round numeric inputs to the precision the training data is recorded at
+        # so repeated requests hit the cache
+        return self._predict_cache(
+            category, location, round(float(area_sqm), _INPUT_DECIMALS),
+            round(float(complexity_score), _INPUT_DECIMALS),
+            round(float(material_quality_score), _INPUT_DECIMALS))
+
+    def _compute_fair_price(self, category, location, area_sqm, complexity_score,
+                            material_quality_score):
+        """Uncached single-row prediction behind predict_fair_price"""
+        # Handle unknown categories or locations (use first entry as default)
+        category_id = self.category_mapping.get(
+            category, self._default_category_id)
+        location_id = self.location_mapping.get(
+            location, self._default_location_id)
 
         # Prepare input features
         X = np.array([[
-            self.category_mapping[category],
-            self.location_mapping[location],
+            category_id,
+            location_id,
             area_sqm,
             complexity_score,
             material_quality_score
-        ]])
+        ]], dtype=np.float32)
+
+        # Make prediction and convert to native Python float. The folded MLP
+        # serves every model this class trains or exports; the TFLite and
+        # TensorFlow paths are fallbacks for artifacts saved without
+        # mlp_weights.npz and for layer stacks the kernel can't fold
+        if self._mlp_params is not None:
+            prediction = float(_mlp_forward_kernel(X, *self._mlp_params)[0, 0])
+        elif self._tflite_interpreter is not None:
+            prediction = float(self._predict_tflite(X)[0, 0])
+        else:
+            # Scale features
+            X_scaled = (X - self._scale_mean) * self._scale_inv_std
+            prediction = float(self._infer_one(
+                tf.constant(X_scaled, dtype=tf.float32)).numpy()[0, 0])
 
-        # Scale features
-        X_scaled = self.scaler.transform(X)
+        return max(0, prediction)  # Ensure price is non-negativ
 
-        # Make prediction
-# Make prediction
-        prediction = self.model.predict(X_scaled)[0][0]
+    def warm_up(self):
+        """
+        Run one single-row and one all-locations prediction through the active
+        inference path so the first request doesn't pay for tensor allocation
+        """
+        if not self.category_mapping or not self.location_mapping:
+            return
+        category = self._categories[0]
+        # Bypass the prediction cache so warm-up doesn't occupy an entry
+        self._compute_fair_price(category, self._locations[0], 0.0, 0.0, 0.0)
+        self._predict_location_ids(category, self._location_ids, 0.0, 0.0, 0.0)
 
-# Convert numpy float32 to native Python float
-        prediction = float(prediction)
+    def _predict_batch(self, X):
+        """
+        Predict prices for a matrix of unscaled feature rows in one forward pass
 
-        return max(0, prediction)  # Ensure price is non-negativ
+        Args:
+            X: float32 feature matrix of shape (n, 5); its numeric columns are
+               rounded in place like predict_fair_price's inputs
+
+        Returns:
+            Numpy array of non-negative predicted prices with shape (n,)
+        """
+        np.round(X[:, 2:], _INPUT_DECIMALS, out=X[:, 2:])
+        # Same precedence and fallbacks as _compute_fair_price
+        if self._mlp_params is not None:
+            predictions = _mlp_forward_kernel(X, *self._mlp_params)
+        elif self._tflite_interpreter is not None:
+            predictions = self._predict_tflite(X)
+        else:
+            X_scaled = (X - self._scale_mean) * self._scale_inv_std
+            predictions = self._infer_many(
+                tf.constant(X_scaled, dtype=tf.float32)).numpy()
+
+        return np.maximum(0, predictions.ravel()).astype(np.float64)
+
+    def predict_fair_prices(self, data):
+        """
+        Predict fair prices for many independent services in one forward pass
+
+        Args:
+            data: Pandas DataFrame with category, location, area_sqm,
+                  complexity_score and material_quality_score columns
+
+        Returns:
+            Numpy array of predicted fair prices aligned with the rows of data
+        """
+        X = self._prepare_features(data)
+
+        # Same unknown-label defaults as predict_fair_price
+        X[X[:, 0] < 0, 0] = self._default_category_id
+        X[X[:, 1] < 0, 1] = self._default_location_id
+
+        return self._predict_batch(X)
+
+    def _predict_location_ids(self, category, location_ids, area_sqm, complexity_score,
+                              material_quality_score):
+        """Predict one service across already-resolved location ids"""
+        X = np.empty((len(location_ids), 5), dtype=np.float32)
+        X[:, 0] = self.category_mapping.get(category, self._default_category_id)
+        X[:, 1] = location_ids
+        X[:, 2] = area_sqm
+        X[:, 3] = complexity_score
+        X[:, 4] = material_quality_score
+
+        return self._predict_batch(X)
 
     def get_market_rates(self, category, location):
         """
@@ -241,72 +843,72 @@ class PriceAnalyzer:
         Returns:
             Dictionary with market rate information
         """
-        # Base rates for different categories (in LKR per day)
-        base_rates = {
-            'Masonry': 3200,        # Bricklaying, plastering, concrete work
-            'Carpentry': 3800,       # Woodwork, door/window installation
-            'Plumbing': 4200,        # Water supply systems, drainage
-            'Electrical': 4500,       # Wiring, electrical installations
-            'Painting': 3000,        # Interior/exterior painting
-            'Tiling': 3400,          # Floor/wall tiling
-            'Roofing': 4200,         # Roof installation and repair
-            'Foundation Work': 5500,  # Excavation, foundation laying
-            'Interior Design': 7500,  # Interior planning and decoration
-            'Landscaping': 3600,     # Garden design, outdoor structures
-            'HVAC': 6000,           # Heating, ventilation, air conditioning
-            'General Contracting': 5000  # Overall project management
-        }
+        # Copy so callers can't mutate the cached entry
+        return dict(self._market_rates_cache(
+            category, location, _today(int(time.time()))))
 
-        # Location adjustment factors (based on cost of living differences)
-        location_factors = {
-            'Colombo': 1.35,       # Capital city, highest costs
-            'Gampaha': 1.25,       # Western province, urban
-            'Kandy': 1.20,         # Central province, urban
-            'Galle': 1.15,         # Southern province, tourist area
-            'Negombo': 1.20,       # Western coastal city
-            'Jaffna': 1.10,        # Northern province capital
-            'Anuradhapura': 0.95,  # North Central province
-            'Batticaloa': 0.90,    # Eastern province
-            'Trincomalee': 0.92,   # Eastern coastal city
-            'Matara': 1.05,        # Southern coastal city
-            'Kurunegala': 0.98,    # North Western province
-            'Ratnapura': 0.95,     # Sabaragamuwa province
-            'Badulla': 0.92,       # Uva province
-            'Nuwara Eliya': 1.10,  # Central highlands, tourist area
-            'Hambantota': 1.05,    # Southern development zone
-            'Kalmunai': 0.88,      # Eastern coastal town
-            'Vavuniya': 0.90,      # Northern inland city
-            'Matale': 0.95,        # Central province
-            'Puttalam': 0.90,      # North Western coastal city
-            'Kegalle': 0.92        # Sabaragamuwa province
-        }
+    def _compute_market_rates(self, category, location, day):
+        """Uncached get_market_rates; day only keys the cache so entries roll over daily"""
+        rates = self.get_market_rates_batch(category, [location])
 
-        # Material cost adjustment (percentage of material costs in total price)
-        material_percentage = {
-            'Masonry': 0.65,
-            'Carpentry': 0.60,
-            'Plumbing': 0.55,
-            'Electrical': 0.60,
-            'Painting': 0.50,
-            'Tiling': 0.70,
-            'Roofing': 0.75,
-            'Foundation Work': 0.70,
-            'Interior Design': 0.50,
-            'Landscaping': 0.55,
-            'HVAC': 0.65,
-            'General Contracting': 0.60
+        # Create response dictionary
+        market_info = {
+            'category': category,
+            'location': location,
+            'base_rate': rates['base_rate'],
+            'location_factor': float(rates['location_factor'][0]),
+            'material_cost_percentage': rates['material_cost_percentage'],
+            'adjusted_rate': float(rates['adjusted_rate'][0]),
+            'min_market_rate': float(rates['min_market_rate'][0]),
+            'max_market_rate': float(rates['max_market_rate'][0]),
+            'avg_market_rate': float(rates['avg_market_rate'][0]),
+            # Number of data points for this rate
+            'sample_size': int(rates['sample_size'][0]),
+            'last_updated': rates['last_updated'],
+            'currency': 'LKR',
+            'unit': 'per day',
+            'material_cost_trend': str(rates['material_cost_trend'][0])
         }
 
+        return market_info
+
+    def get_market_rates_batch(self, category, locations):
+        """
+        Get market rate data for one category across several locations at once
+
+        Args:
+            category: Service category
+            locations: List of locations/districts
+
+        Returns:
+            Dictionary of scalars (category-level values) and arrays aligned with locations
+        """
+        n_locations = len(locations)
+
         # Use default values if category or location not found
-        base_rate = base_rates.get(category, 4000)
-        factor = location_factors.get(location, 1.0)
-        material_factor = material_percentage.get(category, 0.60)
+        category_idx = _MARKET_CATEGORY_INDEX.get(category)
+        if category_idx is None:
+            base_rate = _DEFAULT_BASE_RATE
+            material_factor = _DEFAULT_MATERIAL_PCT
+        else:
+            base_rate = int(_BASE_RATES[category_idx])
+            material_factor = float(_MATERIAL_PCT[category_idx])
+
+        location_idx = np.fromiter(
+            (_MARKET_LOCATION_INDEX.get(loc, -1) for loc in locations),
+            dtype=np.int64, count=n_locations)
+        factor = np.where(location_idx >= 0,
+                          _LOC_FACTORS[location_idx], _DEFAULT_LOC_FACTOR)
 
         # Calculate adjusted rate
         adjusted_rate = base_rate * factor
 
+        # Draw every random term for all locations at once:
+        # material variation, market variance, sample size, cost trend
+        draws = self._rng.random((n_locations, 4))
+
         # Account for material cost variations (±5%)
-        material_variation = random.uniform(0.95, 1.05)
+        material_variation = 0.95 + 0.10 * draws[:, 0]
         material_adjusted_rate = adjusted_rate * \
             (1 + (material_variation - 1) * material_factor)
 
@@ -315,16 +917,11 @@ class PriceAnalyzer:
         max_rate = material_adjusted_rate * 1.10
 
         # Average market rate with slight variance
-        avg_market_rate = random.uniform(
-            material_adjusted_rate * 0.98, material_adjusted_rate * 1.02)
-
-        # Get current date for the rate information
-        current_date = datetime.now().strftime("%Y-%m-%d")
+        avg_market_rate = material_adjusted_rate * (0.98 + 0.04 * draws[:, 1])
 
-        # Create response dictionary
-        market_info = {
+        return {
             'category': category,
-            'location': location,
+            'locations': locations,
             'base_rate': base_rate,
             'location_factor': factor,
             'material_cost_percentage': material_factor * 100,
@@ -332,16 +929,12 @@ class PriceAnalyzer:
             'min_market_rate': min_rate,
             'max_market_rate': max_rate,
             'avg_market_rate': avg_market_rate,
-            # Number of data points for this rate
-            'sample_size': random.randint(25, 150),
-            'last_updated': current_date,
-            'currency': 'LKR',
-            'unit': 'per day',
-            'material_cost_trend': random.choice(['Stable', 'Rising', 'Falling'])
+            'sample_size': 25 + (draws[:, 2] * 126).astype(np.int64),
+            'last_updated': _today(int(time.time())),
+            'material_cost_trend': _MATERIAL_COST_TRENDS[
+                (draws[:, 3] * len(_MATERIAL_COST_TRENDS)).astype(np.int64)]
         }
 
-        return market_info
-
     def generate_training_data(self, size=1000, output_file=None):
         """
         Generate synthetic training data for the model based on Sri Lankan construction market
@@ -440,34 +1033,54 @@ class PriceAnalyzer:
             'General Contracting': (50, 500)
         }
 
-        # Generate data
-        data = []
-        for _ in range(size):
-            category = random.choice(categories)
-            location = random.choice(locations)
-
-            # Generate realistic area based on category
-            min_area, max_area = area_ranges[category]
-            area_sqm = random.uniform(min_area, max_area)
-
-            # Generate realistic complexity and material quality scores
-            # Higher end areas tend to have higher complexity and material quality
-            area_percentile = (area_sqm - min_area) / (max_area - min_area)
-            complexity_base = 3 + area_percentile * 4  # Maps to range 3-7
-            material_base = 3 + area_percentile * 4    # Maps to range 3-7
-
-            # Add some randomness to complexity and material quality
-            complexity_score = min(
-                10, max(1, complexity_base + random.uniform(-2, 2)))
-            material_quality_score = min(
-                10, max(1, material_base + random.uniform(-2, 2)))
+        # Parallel lookup tables indexed by category / location id
+        category_base_rates = np.array([base_rates[c] for c in categories], dtype=np.float64)
+        category_area_impact = np.array([area_impact[c] for c in categories])
+        category_area_min = np.array([area_ranges[c][0] for c in categories], dtype=np.float64)
+        category_area_max = np.array([area_ranges[c][1] for c in categories], dtype=np.float64)
+        location_factor_table = np.array([location_factors[l] for l in locations])
 
+        # Generate data
+        rng = np.random.default_rng()
+        cat_idx = rng.integers(0, len(categories), size)
+        loc_idx = rng.integers(0, len(locations), size)
+
+        # Generate realistic area based on category
+        min_area = category_area_min[cat_idx]
+        max_area = category_area_max[cat_idx]
+        area_sqm = rng.uniform(min_area, max_area)
+
+        # Generate realistic complexity and material quality scores
+        # Higher end areas tend to have higher complexity and material quality
+        area_percentile = (area_sqm - min_area) / (max_area - min_area)
+        complexity_base = 3 + area_percentile * 4  # Maps to range 3-7
+        material_base = 3 + area_percentile * 4    # Maps to range 3-7
+
+        # Add some randomness to complexity and material quality
+        complexity_score = np.clip(
+            complexity_base + rng.uniform(-2, 2, size), 1, 10)
+        material_quality_score = np.clip(
+            material_base + rng.uniform(-2, 2, size), 1, 10)
+
+        # Add seasonal effect (5% random variation)
+        seasonal_effect = rng.uniform(0.95, 1.05, size)
+
+        # Random noise to simulate real-world variation (±8%)
+        noise = rng.uniform(0.92, 1.08, size)
+
+        if numba is not None and size >= _NUMBA_MIN_SAMPLES:
+            price = _synth_prices_kernel(
+                cat_idx, loc_idx, category_base_rates, location_factor_table,
+                category_area_impact, area_sqm, complexity_score,
+                material_quality_score, seasonal_effect, noise
+            ).astype(np.int64)
+        else:
             # Calculate base price
-            base_price = base_rates[category]
-            location_factor = location_factors[location]
+            base_price = category_base_rates[cat_idx]
+            location_factor = location_factor_table[loc_idx]
 
             # Calculate area effect (LKR per sqm, with diminishing returns for larger areas)
-            area_effect = area_impact[category] * \
+            area_effect = category_area_impact[cat_idx] * \
                 (area_sqm ** 0.85)  # Diminishing returns
 
             # Calculate effects of complexity and material quality
@@ -477,156 +1090,29 @@ class PriceAnalyzer:
                 (material_quality_score / 5 - 1) * \
                 0.35  # +/- 35% based on material
 
-            # Add seasonal effect (5% random variation)
-            seasonal_effect = random.uniform(0.95, 1.05)
-
             # Calculate final price
             price = (base_price + area_effect + complexity_effect +
-                     material_effect) * location_factor * seasonal_effect
-
-            # Add some random noise to simulate real-world variation (±8%)
-            price *= random.uniform(0.92, 1.08)
+                     material_effect) * location_factor * seasonal_effect * noise
 
             # Ensure price is positive and round to whole rupees
-            price = max(1, round(price))
-
-            data.append({
-                'category': category,
-                'location': location,
-                'area_sqm': round(area_sqm, 2),
-                'complexity_score': round(complexity_score, 1),
-                'material_quality_score': round(material_quality_score, 1),
-                'price': price
-            })
+            price = np.maximum(1, np.round(price)).astype(np.int64)
 
         # Create DataFrame
-        df = pd.DataFrame(data)
+        df = pd.DataFrame({
+            'category': pd.Categorical.from_codes(cat_idx, categories),
+            'location': pd.Categorical.from_codes(loc_idx, locations),
+            'area_sqm': np.round(area_sqm, 2),
+            'complexity_score': np.round(complexity_score, 1),
+            'material_quality_score': np.round(material_quality_score, 1),
+            'price': price
+        })
 
         # Save to CSV if output file is provided
         if output_file:
-            df.to_csv(output_file, index=False)
+            df.to_csv(output_file, index=False, chunksize=100_000)
 
         return df
 
-    def analyze_regional_pricing(self, category, area_sqm, complexity_score, material_quality_score):
-        """
-        Analyze pricing variations across different regions in Sri Lanka for the same service
-
-        Args:
-            category: Service category
-            area_sqm: Area in square meters
-            complexity_score: Complexity score (1-10)
-            material_quality_score: Material quality score (1-10)
-
-        Returns:
-            Dictionary with regional pricing analysis
-        """
-        # Define the regions to analyze if model doesn't have location mapping yet
-        if not self.location_mapping:
-            locations = [
-                'Colombo', 'Gampaha', 'Kandy', 'Galle', 'Jaffna', 'Anuradhapura',
-                'Batticaloa', 'Trincomalee', 'Matara', 'Kurunegala', 'Ratnapura',
-                'Badulla', 'Negombo', 'Nuwara Eliya', 'Hambantota'
-            ]
-        else:
-            locations = list(self.location_mapping.keys())
-
-        prices = []
-
-        # Group locations by province for more meaningful analysis
-        provinces = {
-            'Western': ['Colombo', 'Gampaha', 'Kalutara', 'Negombo'],
-            'Central': ['Kandy', 'Matale', 'Nuwara Eliya'],
-            'Southern': ['Galle', 'Matara', 'Hambantota'],
-            'Northern': ['Jaffna', 'Vavuniya', 'Mannar', 'Mullaitivu', 'Kilinochchi'],
-            'Eastern': ['Batticaloa', 'Trincomalee', 'Ampara', 'Kalmunai'],
-            'North Western': ['Kurunegala', 'Puttalam'],
-            'North Central': ['Anuradhapura', 'Polonnaruwa'],
-            'Uva': ['Badulla', 'Monaragala'],
-            'Sabaragamuwa': ['Ratnapura', 'Kegalle']
-        }
-
-        # Calculate prices for each location
-        for location in locations:
-            if hasattr(self, 'model') and self.model is not None:
-                # Use the model if available
-                price = self.predict_fair_price(
-                    category, location, area_sqm, complexity_score, material_quality_score
-                )
-            else:
-                # Fallback to estimation based on market rates if model not available
-                market_info = self.get_market_rates(category, location)
-                price = market_info['avg_market_rate'] * \
-                    area_sqm / 10  # Simple estimation
-
-            # Determine province
-            province = "Unknown"
-            for prov, locs in provinces.items():
-                if location in locs:
-                    province = prov
-                    break
-
-            prices.append({
-                'location': location,
-                'province': province,
-                'price': price
-            })
-
-        # Sort by price
-        prices_sorted = sorted(prices, key=lambda x: x['price'])
-
-        # Calculate statistics
-        price_values = [p['price'] for p in prices]
-        avg_price = np.mean(price_values)
-        median_price = np.median(price_values)
-        min_price = np.min(price_values)
-        max_price = np.max(price_values)
-        std_dev = np.std(price_values)
-        price_range = max_price - min_price
-        price_ratio = max_price / min_price if min_price > 0 else float('inf')
-
-        # Calculate provincial averages
-        provincial_averages = {}
-        for province in set(p['province'] for p in prices):
-            province_prices = [p['price']
-                               for p in prices if p['province'] == province]
-            if province_prices:
-                provincial_averages[province] = {
-                    'avg_price': np.mean(province_prices),
-                    'locations': len(province_prices)
-                }
-
-        # Sort provinces by average price
-        provinces_by_price = sorted(
-            provincial_averages.items(),
-            key=lambda x: x[1]['avg_price']
-        )
-
-        # Create result
-        result = {
-            'category': category,
-            'area_sqm': area_sqm,
-            'complexity_score': complexity_score,
-            'material_quality_score': material_quality_score,
-            'avg_price': avg_price,
-            'median_price': median_price,
-            'min_price': min_price,
-            'max_price': max_price,
-            'standard_deviation': std_dev,
-            'price_range': price_range,
-            'price_ratio': price_ratio,
-            'cheapest_location': prices_sorted[0]['location'],
-            'most_expensive_location': prices_sorted[-1]['location'],
-            'cheapest_province': provinces_by_price[0][0] if provinces_by_price else None,
-            'most_expensive_province': provinces_by_price[-1][0] if provinces_by_price else None,
-            'provincial_averages': provincial_averages,
-            'regional_prices': prices_sorted,
-            'analysis_date': datetime.now().strftime("%Y-%m-%d"),
-            'currency': 'LKR'
-        }
-
-        return result
-
     def evaluate_dispute(self, category, location, area_sqm, complexity_score,
                          material_quality_score, contractor_price, client_expectation=None):
         """
@@ -652,27 +1138,22 @@ class PriceAnalyzer:
         
         # Get market rate information
         market_info = self.get_market_rates(category, location)
-        print("hello 3")
         # Calculate price difference percentage
         price_diff_percentage = (
             (contractor_price - fair_price) / fair_price) * 100
-        print("hello 4")
 
         # Determine price fairness
         if abs(price_diff_percentage) <= 10:
             fairness = "Fair"
             recommendation = "The contractor's price is within market expectations."
-            print("hello 5")
         elif price_diff_percentage > 10:
             fairness = "Above Market"
             recommendation = f"The contractor's price is {abs(price_diff_percentage):.1f}% above " \
                 f"the fair market rate. Consider negotiation or finding alternative quotes."
-            print("hello 6")
         else:  # price_diff_percentage < -10
             fairness = "Below Market"
             recommendation = f"The contractor's price is {abs(price_diff_percentage):.1f}% below " \
                 f"the fair market rate, which is favorable for the client."
-            print("hello 7")
 
         # Assess price based on area size adjustment
         area_adjustment = 1.0
@@ -734,7 +1215,7 @@ class PriceAnalyzer:
             'market_rate_avg': market_info['avg_market_rate'],
             'recommendation': recommendation,
             'resolution': resolution,
-            'analysis_date': datetime.now().strftime("%Y-%m-%d"),
+            'analysis_date': _today(int(time.time())),
             'currency': 'LKR'
         }
 
@@ -752,6 +1233,7 @@ class PriceAnalyzer:
         Returns:
             Training history
         """
+        self._ensure_keras_model()
         if self.model is None:
             raise ValueError(
                 "No model exists. Please train a model first or load a pre-trained model.")
@@ -767,21 +1249,29 @@ class PriceAnalyzer:
                 # Assign new index for the location
                 self.location_mapping[location] = len(self.location_mapping)
 
+        self._refresh_feature_dtypes()
+
         # Prepare features
         X = self._prepare_features(new_data)
-        y = new_data['price'].values
+        y = new_data['price'].to_numpy(dtype=np.float32)
 
         # Transform features using existing scaler
-        X_scaled = self.scaler.transform(X)
+        X_scaled = (X - self._scale_mean) * self._scale_inv_std
 
         # Fine-tune the model
         history = self.model.fit(
-            X_scaled, y,
+            self._make_dataset(X_scaled, y, batch_size, shuffle=True),
             epochs=epochs,
-            batch_size=batch_size,
+            shuffle=False,  # The dataset already reshuffles each epoch
             verbose=1
         )
 
+        # Any exported TFLite model and cached prediction no longer match the
+        # updated weights
+        self._tflite_interpreter = None
+        self._predict_cache.cache_clear()
+        self._refresh_mlp_params()
+
         return history
 
     def evaluate_model(self, test_data):
@@ -796,33 +1286,42 @@ class PriceAnalyzer:
         """
         # Prepare test features and target
         X_test = self._prepare_features(test_data)
-        y_test = test_data['price'].values
+        y_test = test_data['price'].to_numpy(dtype=np.float32)
 
         # Scale features using the same scaler
-        X_test_scaled = self.scaler.transform(X_test)
+        X_test_scaled = (X_test - self._scale_mean) * self._scale_inv_std
 
         # Get predictions
-        y_pred = self.model.predict(X_test_scaled).flatten()
+        y_pred = self._infer_many(
+            tf.constant(X_test_scaled, dtype=tf.float32)).numpy().ravel()
+
+        # Calculate metrics from a single residual array, reused in place
+        diff = np.subtract(y_test, y_pred, dtype=np.float64)
+        ss_residual = diff @ diff
+        mse = ss_residual / diff.size
 
-        # Calculate metrics
-        mse = np.mean((y_test - y_pred) ** 2)
-        mae = np.mean(np.abs(y_test - y_pred))
-        mape = np.mean(np.abs((y_test - y_pred) / y_test)) * 100
+        np.abs(diff, out=diff)
+        mae = diff.mean()
+
+        # Zero targets are left out of MAPE instead of producing inf
+        nonzero = y_test != 0
+        np.divide(diff, np.abs(y_test), out=diff, where=nonzero)
+        mape = np.mean(diff, where=nonzero) * 100
 
         # Calculate R-squared
-        ss_total = np.sum((y_test - np.mean(y_test)) ** 2)
-        ss_residual = np.sum((y_test - y_pred) ** 2)
+        ss_total = y_test.var(dtype=np.float64) * y_test.size
         r_squared = 1 - (ss_residual / ss_total)
 
         # Return metrics
         return {
-            'mean_squared_error': mse,
-            'mean_absolute_error': mae,
-            'mean_absolute_percentage_error': mape,
-            'r_squared': r_squared
+            'mean_squared_error': float(mse),
+            'mean_absolute_error': float(mae),
+            'mean_absolute_percentage_error': float(mape),
+            'r_squared': float(r_squared)
         }
 
-    def analyze_regional_pricing(self, category, area_sqm, complexity_score, material_quality_score):
+    def analyze_regional_pricing(self, category, area_sqm, complexity_score, material_quality_score,
+                                 include_regional_prices=True):
         """
         Analyze pricing variations across different regions for the same service
 
@@ -831,6 +1330,7 @@ class PriceAnalyzer:
             area_sqm: Area in square meters
             complexity_score: Complexity score (1-10)
             material_quality_score: Material quality score (1-10)
+            include_regional_prices: Also return every location sorted by price
 
         Returns:
             Dictionary with regional pricing analysis
@@ -839,26 +1339,18 @@ class PriceAnalyzer:
             raise ValueError(
                 "Location mapping not available. Train the model first.")
 
-        locations = list(self.location_mapping.keys())
-        prices = []
-
-        for location in locations:
-            price = self.predict_fair_price(
-                category, location, area_sqm, complexity_score, material_quality_score
-            )
-            prices.append({
-                'location': location,
-                'price': price
-            })
-
-        # Sort by price
-        prices_sorted = sorted(prices, key=lambda x: x['price'])
-
-        # Calculate statistics
-        price_values = [p['price'] for p in prices]
-        avg_price = np.mean(price_values)
-        min_price = np.min(price_values)
-        max_price = np.max(price_values)
+        locations = self._locations
+
+        # Predict every location in a single pass
+        price_values = self._predict_location_ids(
+            category, self._location_ids, area_sqm, complexity_score, material_quality_score)
+
+        # Statistics are single NumPy passes; no sort needed
+        cheapest = int(np.argmin(price_values))
+        most_expensive = int(np.argmax(price_values))
+        avg_price = float(price_values.mean())
+        min_price = float(price_values[cheapest])
+        max_price = float(price_values[most_expensive])
         price_range = max_price - min_price
         price_ratio = max_price / min_price if min_price > 0 else float('inf')
 
@@ -873,14 +1365,22 @@ class PriceAnalyzer:
             'max_price': max_price,
             'price_range': price_range,
             'price_ratio': price_ratio,
-            'cheapest_location': prices_sorted[0]['location'],
-            'most_expensive_location': prices_sorted[-1]['location'],
-            'regional_prices': prices_sorted
+            'cheapest_location': locations[cheapest],
+            'most_expensive_location': locations[most_expensive]
         }
 
+        # Sort by price only when the caller wants the full list
+        if include_regional_prices:
+            order = np.argsort(price_values, kind='stable')
+            result['regional_prices'] = [{
+                'location': locations[i],
+                'price': float(price_values[i])
+            } for i in order]
+
         return result
 
-    def generate_benchmark_report(self, categories=None, area_sqm=100, complexity_score=5, material_quality_score=5):
+    def generate_benchmark_report(self, categories=None, area_sqm=100, complexity_score=5, material_quality_score=5,
+                                  long_format=False, include_summary=False):
         """
         Generate benchmark pricing report for multiple categories and locations
 
@@ -889,6 +1389,10 @@ class PriceAnalyzer:
             area_sqm: Area in square meters
             complexity_score: Complexity score (1-10)
             material_quality_score: Material quality score (1-10)
+            long_format: Return one (category, location, price) row per pair
+                         instead of the category x location pivot
+            include_summary: Append per-category mean/min/max price columns
+                             to the pivot
 
         Returns:
             Pandas DataFrame with benchmark prices
@@ -898,7 +1402,45 @@ class PriceAnalyzer:
                 "Category or location mapping not available. Train the model first.")
 
         if categories is None:
-            categories = list(self.category_mapping.keys())
+            categories = self._categories
+            category_ids = self._category_ids
+        else:
+            category_ids = np.fromiter(
+                (self.category_mapping.get(cat, self._default_category_id)
+                 for cat in categories),
+                dtype=np.int32, count=len(categories))
+
+        locations = self._locations
+        location_ids = self._location_ids
+        n_categories = len(categories)
+        n_locations = len(locations)
+
+        # One row per (category, location) pair, category-major
+
+        X = np.empty((n_categories * n_locations, 5), dtype=np.float32)
+        X[:, 0] = np.repeat(category_ids, n_locations)
+        X[:, 1] = np.tile(location_ids, n_categories)
+        X[:, 2] = area_sqm
+        X[:, 3] = complexity_score
+        X[:, 4] = material_quality_score
+
+        # Predict the whole grid at once and lay it out as category x location
+        prices = self._predict_batch(X).reshape(n_categories, n_locations)
+
+        pivot_df = pd.DataFrame(
+            prices,
+            index=pd.Index(categories, name='category'),
+            columns=pd.Index(locations, name='location')
+        )
+
+        if long_format:
+            return pivot_df.stack().reset_index(name='price')
+
+        if include_summary:
+            means, mins, maxs = _row_stats(prices)
+            pivot_df['mean_price'] = means
+            pivot_df['min_price'] = mins
+            pivot_df['max_price'] = maxs
 
-        locations = list(self.location_mapping.keys())
+        return pivot_df
 
@@ -1,56 +1,243 @@
-import pandas as pd
-from flask import Flask, request, jsonify
+from flask import (Flask, Response, g, has_request_context, request, jsonify,
+                   stream_with_context)
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import and_, event, func, or_, select
+from sqlalchemy.engine import Engine, Row
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import selectinload
 import uuid
-from datetime import datetime
+from datetime import date, datetime, timezone
 import bcrypt
+import click
 import requests  # For integrating with Resend API
+from urllib3.util.retry import Retry
+from itertools import chain
 import logging
+import os
+import threading
+import time
+try:
+    import orjson
+except ImportError:  # Optional: falls back to Flask's stdlib json encoder
+    orjson = None
 # Assuming you have a PriceAnalyzer class
 from PriceAnalyzer import PriceAnalyzer
 
 
+# Models are serialized with their datetime values left as-is; both providers
+# emit them in ISO 8601, which is what orjson produces natively
+class IsoJSONProvider(DefaultJSONProvider):
+    # Emit keys in insertion order; sorting every dict costs CPU on each
+    # response and clients don't depend on key order
+    sort_keys = False
+
+    @staticmethod
+    def default(o):
+        if isinstance(o, date):
+            return o.isoformat()
+        return DefaultJSONProvider.default(o)
+
+
+# Serializes jsonify() responses with orjson when it is installed; it writes
+# bytes directly and handles NumPy scalars/arrays without per-float boxing
+class OrjsonProvider(IsoJSONProvider):
+    option = (orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+              if orjson is not None else 0)
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default,
+                            option=self.option).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default, option=self.option),
+            mimetype=self.mimetype)
+
+
 # Initialize Flask app
 app = Flask(__name__)
+app.json = OrjsonProvider(app) if orjson is not None else IsoJSONProvider(app)
 CORS(app)  # Enable CORS for all routes
 
-# Configure SQLite database
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///construction_platform.db'
+# Configure SQLite database (API_DATABASE_URL points tests at a scratch
+# copy; DATABASE_URL is left to the Prisma schema in .env)
+app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get(
+    'API_DATABASE_URL', 'sqlite:///construction_platform.db')
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-
-logging.basicConfig(level=logging.INFO)
+# Enough pooled connections for every gthread worker thread plus bursts
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+    'pool_size': 10,
+    'max_overflow': 20,
+    # Room in the compiled-statement cache for every endpoint's query shapes
+    'query_cache_size': 1200,
+}
+
+
+# WAL lets readers proceed while a commit is being written, and NORMAL
+# synchronous mode drops one fsync per commit (still safe under WAL); temp
+# b-trees for ORDER BY / DISTINCT stay in memory instead of temp files
+@event.listens_for(Engine, "connect")
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    if type(dbapi_connection).__module__ != 'sqlite3':
+        return
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA mmap_size=268435456")
+    cursor.execute("PRAGMA cache_size=-65536")
+    cursor.close()
+
+
+# Quiet by default; set LOG_LEVEL=DEBUG to see per-request diagnostics
+logging.basicConfig(
+    level=os.environ.get('LOG_LEVEL', 'WARNING').upper(),
+    format='%(asctime)s %(levelname)s %(name)s %(message)s')
+logger = logging.getLogger(__name__)
+
+
+# With LOG_LEVEL=DEBUG, log how many SQL statements each request issued, so an
+# N+1 regression shows up as a jump in the count for that endpoint
+if logger.isEnabledFor(logging.DEBUG):
+    @event.listens_for(Engine, "before_cursor_execute")
+    def count_request_queries(*args):
+        if has_request_context():
+            g.query_count = g.get('query_count', 0) + 1
+
+    # Teardown rather than after_request, so streamed responses are counted
+    # once their generator has finished
+    @app.teardown_request
+    def log_request_query_count(exc):
+        logger.debug("%s %s: %d SQL statements", request.method,
+                     request.path, g.get('query_count', 0))
 
 # Initialize SQLAlchemy
 db = SQLAlchemy(app)
 
-# Placeholder PriceAnalyzer class (replace with actual implementation)
-
-
-# Initialize PriceAnalyzer
-analyzer = PriceAnalyzer()
+# Trained model artifact shared by every worker; build it once per deploy
+# with `flask --app api train-model`
+MODEL_PATH = os.environ.get(
+    'MODEL_PATH', os.path.join(app.instance_path, 'price_model', 'model.keras'))
+
+# PriceAnalyzer is built lazily on first use so that every WSGI worker process
+# constructs its own TensorFlow model instead of inheriting one across fork()
+_analyzer = None
+_analyzer_lock = threading.Lock()
+
+
+def get_analyzer():
+    global _analyzer
+    if _analyzer is None:
+        with _analyzer_lock:
+            if _analyzer is None:
+                if not os.path.exists(MODEL_PATH):
+                    # Falls back to training on random synthetic data, so
+                    # each worker would estimate different fair prices
+                    logger.warning("No trained model at %s, training one in "
+                                   "this process; run flask train-model",
+                                   MODEL_PATH)
+                _analyzer = PriceAnalyzer(model_path=MODEL_PATH)
+    return _analyzer
+
+
+# One pooled HTTP session for outbound API calls (Resend), so repeated
+# requests reuse a warm keep-alive TLS connection instead of a new handshake.
+# Only failed connection attempts are retried (POST is not idempotent, so a
+# request that reached the server is never resent)
+http_session = requests.Session()
+http_session.mount('https://', requests.adapters.HTTPAdapter(
+    pool_connections=4, pool_maxsize=16,
+    max_retries=Retry(total=2, backoff_factor=0.2)))
+# Seconds to wait for connect / response, so a slow upstream can't hold a
+# worker thread indefinitely
+HTTP_TIMEOUT = (3.05, 10)
 
 # User types
 USER_TYPE_CONTRACTOR = "contractor"
 USER_TYPE_TRADESMAN = "tradesman"
 
+def parse_uuid(value):
+    # The UUID a request value names, or None for anything else (including
+    # non-string JSON values such as numbers)
+    if not isinstance(value, str):
+        return None
+    try:
+        return uuid.UUID(value)
+    except ValueError:
+        return None
+
+
+# Stores UUIDs as 16 raw bytes instead of 36-character strings, so primary
+# and foreign key comparisons and index pages are smaller. The application
+# still sees the canonical string form.
+class UUIDBytes(db.TypeDecorator):
+    impl = db.LargeBinary(16)
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        parsed = parse_uuid(value)
+        # Not a UUID (e.g. a bad id in the URL): bind NULL, which no stored
+        # id equals, so lookups find nothing and inserts fail NOT NULL
+        return parsed.bytes if parsed is not None else None
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        if isinstance(value, str):
+            # Text id left by an earlier version (see `flask migrate-db`)
+            return value
+        return str(uuid.UUID(bytes=value))
+
+
+def new_uuid():
+    # Time-ordered UUIDv7 (RFC 9562): a 48-bit millisecond timestamp then
+    # random bits, so new rows are appended at the right edge of the primary
+    # key index instead of splitting pages at random positions
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(
+        os.urandom(10), 'big')
+    value = (value & ~(0xF << 76)) | (0x7 << 76)  # version 7
+    value = (value & ~(0x3 << 62)) | (0x2 << 62)  # RFC 4122 variant
+    return str(uuid.UUID(int=value))
+
+
+def utc_now():
+    # Timezone-aware replacement for the deprecated datetime.utcnow; SQLite
+    # DateTime columns store it as the same naive UTC text as before
+    return datetime.now(timezone.utc)
+
+
 # Database Models
 
 
 class User(db.Model):
-    id = db.Column(db.String(36), primary_key=True,
-                   default=lambda: str(uuid.uuid4()))
+    id = db.Column(UUIDBytes, primary_key=True,
+                   default=new_uuid)
     username = db.Column(db.String(80), unique=True, nullable=False)
     password = db.Column(db.String(128), nullable=False)
     user_type = db.Column(db.String(20), nullable=False)
 
 
 class Job(db.Model):
-    id = db.Column(db.String(36), primary_key=True,
-                   default=lambda: str(uuid.uuid4()))
+    # list_jobs filters on status (optionally also category and location)
+    # and sorts by created_at then id, so pages are read straight off the
+    # index with no sort step
+    __table_args__ = (
+        db.Index('ix_job_status_created_id', 'status', 'created_at', 'id'),
+        db.Index('ix_job_category_location_status_created_id',
+                 'category', 'location', 'status', 'created_at', 'id'),
+    )
+
+    id = db.Column(UUIDBytes, primary_key=True,
+                   default=new_uuid)
     title = db.Column(db.String(200), nullable=False)
     category = db.Column(db.String(100), nullable=False)
-    location = db.Column(db.String(100), nullable=False)
+    location = db.Column(db.String(100), nullable=False, index=True)
     description = db.Column(db.Text, nullable=False)
     area_sqm = db.Column(db.Float, nullable=False)
     complexity_score = db.Column(db.Float, nullable=False)
@@ -58,31 +245,69 @@ class Job(db.Model):
     budget = db.Column(db.Float, nullable=False)
     deadline = db.Column(db.String(50), nullable=False)
     contractor_id = db.Column(
-        db.String(36), db.ForeignKey('user.id'), nullable=False)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+        UUIDBytes, db.ForeignKey('user.id'), nullable=False, index=True)
+    created_at = db.Column(db.DateTime, default=utc_now)
     status = db.Column(db.String(20), default="open")
     fair_price_estimate = db.Column(db.Float, nullable=False)
-    applications = db.relationship('Application', backref='job', lazy=True)
+    # Lazy by default; endpoints that need the collection opt in per query
+    # (e.g. selectinload) so single-job lookups don't pay for it
+    applications = db.relationship(
+        'Application', back_populates='job', lazy='select')
 
 
 class Application(db.Model):
-    id = db.Column(db.String(36), primary_key=True,
-                   default=lambda: str(uuid.uuid4()))
-    job_id = db.Column(db.String(36), db.ForeignKey('job.id'), nullable=False)
+    # Applications are listed per job and per tradesman, newest first
+    # (created_at then id, as for jobs); a tradesman can apply to a job only
+    # once
+    __table_args__ = (
+        db.Index('ix_application_job_created_id',
+                 'job_id', 'created_at', 'id'),
+        db.Index('ix_application_job_tradesman', 'job_id', 'tradesman_id',
+                 unique=True),
+        db.Index('ix_application_tradesman_created_id',
+                 'tradesman_id', 'created_at', 'id'),
+    )
+
+    id = db.Column(UUIDBytes, primary_key=True,
+                   default=new_uuid)
+    job_id = db.Column(UUIDBytes, db.ForeignKey('job.id'), nullable=False)
     tradesman_id = db.Column(
-        db.String(36), db.ForeignKey('user.id'), nullable=False)
+        UUIDBytes, db.ForeignKey('user.id'), nullable=False)
     price_quote = db.Column(db.Float, nullable=False)  # Added field
     estimated_days = db.Column(db.Integer, nullable=False)  # Added field
     cover_letter = db.Column(db.Text)  # Optional field
     availability_date = db.Column(db.String(50))  # Optional field
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=utc_now)
     status = db.Column(db.String(20), default="pending")
+    job = db.relationship('Job', back_populates='applications', lazy='select')
+
+# bcrypt work factor, the library default of 12 unless overridden; tune it to
+# the server so one hash takes a few hundred milliseconds. Hashes made with a
+# lower cost are upgraded on the user's next successful login
+BCRYPT_ROUNDS = int(os.environ.get('BCRYPT_ROUNDS', 12))
+
+# A hash faster than this is too cheap to brute-force offline; raise
+# BCRYPT_ROUNDS until one hash takes 250-500 ms on the server
+MIN_PASSWORD_HASH_SECONDS = 0.25
+
+# Checked against when the username doesn't exist, so a failed login costs
+# one bcrypt verification either way and response time doesn't reveal which
+# usernames are registered. Creating it doubles as the boot-time cost check.
+_hash_started = time.perf_counter()
+DUMMY_PASSWORD_HASH = bcrypt.hashpw(
+    b'dummy-password', bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode('utf-8')
+_hash_seconds = time.perf_counter() - _hash_started
+if _hash_seconds < MIN_PASSWORD_HASH_SECONDS:
+    logger.warning(
+        "bcrypt with BCRYPT_ROUNDS=%d takes %.0f ms per hash, under the "
+        "%.0f ms target; raise BCRYPT_ROUNDS", BCRYPT_ROUNDS,
+        _hash_seconds * 1000, MIN_PASSWORD_HASH_SECONDS * 1000)
 
 # Helper function to hash passwords
 
 
 def hash_password(password):
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=BCRYPT_ROUNDS))
 
 # Helper function to verify passwords
 
@@ -91,21 +316,91 @@ def verify_password(stored_password, provided_password):
     return bcrypt.checkpw(provided_password.encode('utf-8'), stored_password.encode('utf-8'))
 
 
+def password_needs_rehash(stored_password):
+    # bcrypt hashes are "$2b$<cost>$<salt+hash>". Only weaker hashes are
+    # replaced, so lowering BCRYPT_ROUNDS never downgrades existing accounts
+    return int(stored_password.split('$')[2]) < BCRYPT_ROUNDS
+
+
+# Required request fields per endpoint, kept as module-level tuples instead of
+# rebuilding a list on every request
+REGISTER_FIELDS = ('username', 'password', 'user_type')
+LOGIN_FIELDS = ('username', 'password')
+CREATE_JOB_FIELDS = ('title', 'category', 'location', 'description',
+                     'area_sqm', 'complexity_score', 'material_quality_score',
+                     'budget', 'deadline', 'contractor_id')
+SUBMIT_APPLICATION_FIELDS = ('job_id', 'tradesman_id')
+SEND_DISPUTE_REPORT_FIELDS = ('phoneNumber', 'jobTitle',
+                              'jobLocation', 'issueDate', 'additionalNotes')
+SUBMIT_JOB_APPLICATION_FIELDS = ('tradesman_id', 'price_quote', 'estimated_days')
+
+# Request fields holding a user, job or application id
+ID_FIELDS = frozenset(('contractor_id', 'job_id', 'tradesman_id'))
+
+# Job fields the fair price estimate depends on
+FAIR_PRICE_FIELDS = ('category', 'location', 'area_sqm',
+                     'complexity_score', 'material_quality_score')
+# Job columns update_job may overwrite: every column except identity and
+# ownership (relationships and other model attributes are never assignable)
+UPDATABLE_JOB_FIELDS = frozenset(
+    column.name for column in Job.__table__.columns
+) - {'id', 'contractor_id', 'created_at'}
+
+# Allowed values for request fields, checked by set membership
+USER_TYPES = frozenset((USER_TYPE_CONTRACTOR, USER_TYPE_TRADESMAN))
+JOB_STATUS_UPDATES = frozenset(('ongoing', 'dispute', 'completed'))
+COMPLETABLE_JOB_STATUSES = frozenset(('ongoing', 'assigned'))
+APPLICATION_STATUS_UPDATES = frozenset(
+    ('approved', 'rejected', 'closed', 'dispute'))
+
+# Helper function to report the first missing required field
+
+
+def body_error(data):
+    # Bodies are parsed with get_json(silent=True), so malformed or non-JSON
+    # input arrives here as None and is rejected as a client error
+    if not isinstance(data, dict):
+        return jsonify({"error": "Request body must be a JSON object"}), 400
+    return None
+
+
+def missing_field_error(data, required_fields):
+    error = body_error(data)
+    if error:
+        return error
+    for field in required_fields:
+        if field not in data:
+            return jsonify({"error": f"Missing required field: {field}"}), 400
+        if field in ID_FIELDS and parse_uuid(data[field]) is None:
+            return jsonify({"error": f"Invalid {field}: must be a UUID string"}), 400
+    return None
+
+
+def conditional_json(payload):
+    # Tag read-only responses with a hash of their body so clients that send
+    # it back in If-None-Match get an empty 304 when nothing has changed
+    response = jsonify(payload)
+    response.add_etag()
+    return response.make_conditional(request)
+
+
 @app.route('/api/contractors/<contractor_id>/tasks', methods=['GET'])
 def get_contractor_tasks(contractor_id):
     try:
         # Verify the contractor exists
-        contractor = User.query.get(contractor_id)
+        contractor = db.session.get(User, contractor_id)
         if not contractor or contractor.user_type != USER_TYPE_CONTRACTOR:
             return jsonify({"error": "Invalid contractor"}), 400
 
-        # Get all jobs posted by this contractor
-        jobs = Job.query.filter_by(contractor_id=contractor_id).all()
+        # Get all jobs posted by this contractor, with their applications
+        # loaded in one extra IN query rather than one query per job
+        jobs = db.session.scalars(
+            select(Job).options(selectinload(Job.applications)).filter_by(
+                contractor_id=contractor_id)).all()
 
         # jobs = Job.query.all()
-        logging.info("jobs =>>")
         for job in jobs:
-            logging.info(job.contractor_id + " : " + job.id)
+            logger.debug("job %s contractor %s", job.id, job.contractor_id)
         # print(jobs)
 
         # Prepare response data
@@ -115,8 +410,7 @@ def get_contractor_tasks(contractor_id):
             # accepted_app = Application.query.filter_by(
             #     job_id=job.id, status='accepted').first()
 
-            accepted_app = Application.query.filter_by(
-                job_id=job.id).first()
+            accepted_app = job.applications[0] if job.applications else None
 
             task_data = {
                 "id": job.id,
@@ -129,7 +423,7 @@ def get_contractor_tasks(contractor_id):
                 "material_quality_score": job.material_quality_score,
                 "budget": job.budget,
                 "deadline": job.deadline,
-                "created_at": job.created_at.isoformat()
+                "created_at": job.created_at
             }
 
             # if accepted_app is not None:
@@ -155,36 +449,16 @@ def get_contractor_tasks(contractor_id):
 def get_tradesman_tasks(tradesman_id):
     try:
         # Verify the tradesman exists
-        tradesman = User.query.get(tradesman_id)
+        tradesman = db.session.get(User, tradesman_id)
         if not tradesman or tradesman.user_type != USER_TYPE_TRADESMAN:
             return jsonify({"error": "Invalid tradesman"}), 400
 
-        # Get all accepted applications for this tradesman
-        applications = Application.query.filter_by(
-            tradesman_id=tradesman_id
-        ).all()
-        logging.info(f"applications: {applications}")
-        # Prepare response data
-        tasks = []
-        for app in applications:
-            job = Job.query.get(app.job_id)
-            if job:
-                tasks.append({
-                    "id": job.id,
-                    "title": job.title,
-                    "category": job.category,
-                    "location": job.location,
-                    "description": job.description,
-                    "area_sqm": job.area_sqm,
-                    "complexity_score": job.complexity_score,
-                    "material_quality_score": job.material_quality_score,
-                    "budget": job.budget,
-                    "deadline": job.deadline,
-                    "status": app.status,
-                    "created_at": job.created_at.isoformat(),
-                    "price_quote": app.price_quote,
-                    "estimated_days": app.estimated_days
-                })
+        # Get all applications for this tradesman together with their jobs
+        # in one JOIN (applications without a job are skipped)
+        tasks = [row._asdict() for row in db.session.execute(
+            select(*TRADESMAN_TASK_COLUMNS)
+            .join(Job, Application.job_id == Job.id)
+            .where(Application.tradesman_id == tradesman_id))]
 
         return jsonify({"tasks": tasks}), 200
 
@@ -197,12 +471,15 @@ def get_tradesman_tasks(tradesman_id):
 @app.route('/api/jobs/<job_id>/status', methods=['PUT'])
 def update_job_status(job_id):
     try:
-        job = Job.query.get(job_id)
+        job = db.session.get(Job, job_id)
         if not job:
             return jsonify({"error": "Job not found"}), 404
 
-        data = request.json
-        if 'status' not in data or data['status'] not in ['ongoing', 'dispute', 'completed']:
+        data = request.get_json(silent=True)
+        error = body_error(data)
+        if error:
+            return error
+        if 'status' not in data or data['status'] not in JOB_STATUS_UPDATES:
             return jsonify({"error": "Invalid status. Must be 'ongoing', 'dispute', or 'completed'"}), 400
 
         # Update job status
@@ -225,11 +502,14 @@ def update_job_status(job_id):
 @app.route('/api/jobs/<job_id>/dispute', methods=['POST'])
 def report_job_dispute(job_id):
     try:
-        job = Job.query.get(job_id)
+        job = db.session.get(Job, job_id)
         if not job:
             return jsonify({"error": "Job not found"}), 404
 
-        data = request.json
+        data = request.get_json(silent=True)
+        error = body_error(data)
+        if error:
+            return error
         if 'reported_by' not in data or 'reason' not in data:
             return jsonify({"error": "Missing required fields: reported_by, reason"}), 400
 
@@ -257,11 +537,14 @@ def report_job_dispute(job_id):
 @app.route('/api/jobs/<job_id>/resolve-dispute', methods=['POST'])
 def resolve_job_dispute(job_id):
     try:
-        job = Job.query.get(job_id)
+        job = db.session.get(Job, job_id)
         if not job or job.status != 'dispute':
             return jsonify({"error": "Job not found or not in dispute status"}), 404
 
-        data = request.json
+        data = request.get_json(silent=True)
+        error = body_error(data)
+        if error:
+            return error
         if 'resolution' not in data or 'resolved_by' not in data:
             return jsonify({"error": "Missing required fields: resolution, resolved_by"}), 400
 
@@ -288,11 +571,14 @@ def resolve_job_dispute(job_id):
 @app.route('/api/jobs/<job_id>/complete', methods=['POST'])
 def complete_job(job_id):
     try:
-        job = Job.query.get(job_id)
-        if not job or job.status not in ['ongoing', 'assigned']:
+        job = db.session.get(Job, job_id)
+        if not job or job.status not in COMPLETABLE_JOB_STATUSES:
             return jsonify({"error": "Job not found or not in appropriate status"}), 404
 
-        data = request.json
+        data = request.get_json(silent=True)
+        error = body_error(data)
+        if error:
+            return error
         if 'completed_by' not in data:
             return jsonify({"error": "Missing required field: completed_by"}), 400
 
@@ -320,17 +606,17 @@ def complete_job(job_id):
 @app.route('/api/register', methods=['POST'])
 def register():
     try:
-        data = request.json
+        data = request.get_json(silent=True)
         # Validate required fields
-        required_fields = ['username', 'password', 'user_type']
-        for field in required_fields:
-            if field not in data:
-                return jsonify({"error": f"Missing required field: {field}"}), 400
+        error = missing_field_error(data, REGISTER_FIELDS)
+        if error:
+            return error
         # Validate user type
-        if data['user_type'] not in [USER_TYPE_CONTRACTOR, USER_TYPE_TRADESMAN]:
+        if data['user_type'] not in USER_TYPES:
             return jsonify({"error": "Invalid user type. Must be 'contractor' or 'tradesman'"}), 400
-        # Check if username already exists
-        if User.query.filter_by(username=data['username']).first():
+        # Check if username already exists (EXISTS on the unique index, no row load)
+        if db.session.scalar(select(
+                select(User.id).filter_by(username=data['username']).exists())):
             return jsonify({"error": "Username already exists"}), 400
         # Create user object
         hashed_password = hash_password(data['password']).decode('utf-8')
@@ -361,16 +647,24 @@ def register():
 @app.route('/api/login', methods=['POST'])
 def login():
     try:
-        data = request.json
+        data = request.get_json(silent=True)
         # Validate required fields
-        required_fields = ['username', 'password']
-        for field in required_fields:
-            if field not in data:
-                return jsonify({"error": f"Missing required field: {field}"}), 400
+        error = missing_field_error(data, LOGIN_FIELDS)
+        if error:
+            return error
         # Find user by username
-        user = User.query.filter_by(username=data['username']).first()
-        if not user or not verify_password(user.password, data['password']):
+        user = db.session.scalar(
+            select(User).filter_by(username=data['username']))
+        if not user:
+            verify_password(DUMMY_PASSWORD_HASH, data['password'])
+            return jsonify({"error": "Invalid username or password"}), 401
+        if not verify_password(user.password, data['password']):
             return jsonify({"error": "Invalid username or password"}), 401
+        # The plaintext is only available here, so this is where a hash with
+        # a lower cost than BCRYPT_ROUNDS gets upgraded
+        if password_needs_rehash(user.password):
+            user.password = hash_password(data['password']).decode('utf-8')
+            db.session.commit()
         return jsonify({
             "message": "Login successful",
             "user_id": user.id,
@@ -385,22 +679,29 @@ def login():
 @app.route('/api/create-job', methods=['POST'])
 def create_job():
     try:
-        data = request.json
-        print(data)
+        data = request.get_json(silent=True)
+        logger.debug("create_job data=%s", data)
         # Validate required fields
-        required_fields = ['title', 'category', 'location', 'description',
-                           'area_sqm', 'complexity_score', 'material_quality_score',
-                           'budget', 'deadline', 'contractor_id']
-        for field in required_fields:
-            if field not in data:
-                return jsonify({"error": f"Missing required field: {field}"}), 400
+        error = missing_field_error(data, CREATE_JOB_FIELDS)
+        if error:
+            return error
+        # Coerce numeric fields once; numeric strings become floats here and
+        # anything else is rejected before touching the model or database
+        try:
+            area_sqm = float(data['area_sqm'])
+            complexity_score = float(data['complexity_score'])
+            material_quality_score = float(data['material_quality_score'])
+            budget = float(data['budget'])
+        except (TypeError, ValueError):
+            return jsonify({"error": "area_sqm, complexity_score, material_quality_score "
+                                     "and budget must be numbers"}), 400
         # Get fair price estimate
-        fair_price = analyzer.predict_fair_price(
+        fair_price = get_analyzer().predict_fair_price(
             category=data['category'],
             location=data['location'],
-            area_sqm=float(data['area_sqm']),
-            complexity_score=float(data['complexity_score']),
-            material_quality_score=float(data['material_quality_score'])
+            area_sqm=area_sqm,
+            complexity_score=complexity_score,
+            material_quality_score=material_quality_score
         )
         # Create job object
         new_job = Job(
@@ -408,10 +709,10 @@ def create_job():
             category=data['category'],
             location=data['location'],
             description=data['description'],
-            area_sqm=float(data['area_sqm']),
-            complexity_score=float(data['complexity_score']),
-            material_quality_score=float(data['material_quality_score']),
-            budget=float(data['budget']),
+            area_sqm=area_sqm,
+            complexity_score=complexity_score,
+            material_quality_score=material_quality_score,
+            budget=budget,
             deadline=data['deadline'],
             contractor_id=data['contractor_id'],
             fair_price_estimate=round(fair_price, 2)
@@ -434,7 +735,7 @@ def create_job():
                 "budget": new_job.budget,
                 "deadline": new_job.deadline,
                 "contractor_id": new_job.contractor_id,
-                "created_at": new_job.created_at.isoformat(),
+                "created_at": new_job.created_at,
                 "status": new_job.status,
                 "fair_price_estimate": new_job.fair_price_estimate
             }
@@ -450,17 +751,16 @@ def create_job():
 def list_usrs():
     try:
 
-        user_query = User.query.all()
+        # Select only the serialized columns; rows become dicts without
+        # building User objects (or loading password hashes)
+        user_query = db.session.execute(
+            select(User.id, User.username, User.user_type))
 
-        serialized_users = [{
-            "id": user.id,
-            "username": user.username,
-            "user_type": user.user_type
-        }for user in user_query]
-        return jsonify({
+        serialized_users = [user._asdict() for user in user_query]
+        return conditional_json({
             "jobs": serialized_users,
             "count": len(serialized_users)
-        }), 200
+        })
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -468,21 +768,92 @@ def list_usrs():
 @app.route('/api/applications', methods=['GET'])
 def list_applications():
     try:
-        apps_query = Application.query.all()
-        serialized_apps = [{
-            "id": apps.id,
-            "tradesman_id": apps.tradesman_id,
-            "job_id": apps.job_id,
-            "status": apps.status
-        }for apps in apps_query]
-        return jsonify({
+        apps_query = db.session.execute(select(
+            Application.id, Application.tradesman_id, Application.job_id,
+            Application.status))
+        serialized_apps = [apps._asdict() for apps in apps_query]
+        return conditional_json({
             "jobs": serialized_apps,
             "count": len(serialized_apps)
-        }), 200
+        })
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
+# SQLite stores DateTime columns as 'YYYY-MM-DD HH:MM:SS.ffffff' text; listing
+# endpoints return that text in ISO 8601 form straight from SQL instead of
+# parsing it into datetime objects only to format them again
+def iso_timestamp(column):
+    return func.replace(column, ' ', 'T').label(column.key)
+
+
+# Columns returned by list_jobs, selected directly instead of loading Job objects
+JOB_LIST_COLUMNS = (
+    Job.id, Job.title, Job.category, Job.location, Job.description,
+    Job.area_sqm, Job.complexity_score, Job.material_quality_score,
+    Job.budget, Job.deadline, Job.contractor_id, iso_timestamp(Job.created_at),
+    Job.status, Job.fair_price_estimate
+)
+# Columns returned by get_tradesman_tasks: the job, with the status and quote
+# of the tradesman's application
+TRADESMAN_TASK_COLUMNS = (
+    Job.id, Job.title, Job.category, Job.location, Job.description,
+    Job.area_sqm, Job.complexity_score, Job.material_quality_score,
+    Job.budget, Job.deadline, Application.status,
+    iso_timestamp(Job.created_at), Application.price_quote,
+    Application.estimated_days
+)
+MAX_PAGE_SIZE = 200
+JOBS_STREAM_BATCH = 200
+APPLICATIONS_STREAM_BATCH = 200
+
+
+def keyset_page(query, created_at_column, id_column, limit, cursor):
+    # Limit a newest-first query to one page, starting after the
+    # "created_at|id" cursor of the previous page's last row (id breaks
+    # created_at ties). Raises ValueError for a malformed cursor.
+    if cursor:
+        cursor_created_at, cursor_id = cursor.split('|', 1)
+        cursor_created_at = datetime.fromisoformat(cursor_created_at)
+        # A bad id would bind NULL and return an empty, final-looking page
+        if parse_uuid(cursor_id) is None:
+            raise ValueError(f"Invalid cursor id: {cursor_id!r}")
+        # The plain upper bound lets SQLite seek into the (..., created_at,
+        # id) index; the OR alone would re-read every newer row per page
+        query = query.filter(created_at_column <= cursor_created_at, or_(
+            created_at_column < cursor_created_at,
+            and_(created_at_column == cursor_created_at, id_column < cursor_id)
+        ))
+    limit = min(max(limit or MAX_PAGE_SIZE, 1), MAX_PAGE_SIZE)
+    return query.limit(limit), limit
+
+
+def next_page_cursor(rows, limit):
+    # A short page is the last one
+    if len(rows) < limit:
+        return None
+    return f"{rows[-1]['created_at']}|{rows[-1]['id']}"
+
+
+def generate_json_stream(key, batches, serialize):
+    # Stream {key: [...], "count": n}, one chunk per batch. The 200 status has
+    # already been sent, so a failure part-way through is logged and the body
+    # is closed with an "error" member after the rows sent so far: it stays
+    # valid JSON, and clients must check for "error" before trusting "count"
+    yield '{"%s":[' % key
+    count = 0
+    try:
+        for batch in batches:
+            rows = app.json.dumps([serialize(row) for row in batch])[1:-1]
+            yield (',' + rows) if count else rows
+            count += len(batch)
+    except Exception:
+        logger.exception("Streaming %s failed after %d rows", key, count)
+        yield '],"count":%d,"error":"Listing truncated by a server error"}' % count
+        return
+    yield '],"count":%d}' % count
+
+
 @app.route('/api/jobs', methods=['GET'])
 def list_jobs():
     try:
@@ -492,40 +863,55 @@ def list_jobs():
         status = request.args.get('status', 'open')  # Default to open jobs
         user_id = request.args.get('user_id')
         user_type = request.args.get('user_type')
+        # Optional keyset pagination: pass limit, then the returned next_cursor
+        limit = request.args.get('limit', type=int)
+        cursor = request.args.get('cursor')
         # Query jobs from the database
-        job_query = Job.query
+        job_query = select(*JOB_LIST_COLUMNS)
         # Apply filters
         if category:
-            job_query = job_query.filter_by(category=category)
+            job_query = job_query.where(Job.category == category)
         if location:
-            job_query = job_query.filter_by(location=location)
+            job_query = job_query.where(Job.location == location)
         if status:
-            job_query = job_query.filter_by(status=status)
+            job_query = job_query.where(Job.status == status)
         if user_id and user_type == USER_TYPE_CONTRACTOR:
-            job_query = job_query.filter_by(contractor_id=user_id)
-        # Sort by creation date (newest first)
-        jobs_list = job_query.order_by(Job.created_at.desc()).all()
-        # Serialize jobs
-        serialized_jobs = [{
-            "id": job.id,
-            "title": job.title,
-            "category": job.category,
-            "location": job.location,
-            "description": job.description,
-            "area_sqm": job.area_sqm,
-            "complexity_score": job.complexity_score,
-            "material_quality_score": job.material_quality_score,
-            "budget": job.budget,
-            "deadline": job.deadline,
-            "contractor_id": job.contractor_id,
-            "created_at": job.created_at.isoformat(),
-            "status": job.status,
-            "fair_price_estimate": job.fair_price_estimate
-        } for job in jobs_list]
-        return jsonify({
+            job_query = job_query.where(Job.contractor_id == user_id)
+        # Sort by creation date (newest first); id breaks ties for the cursor
+        job_query = job_query.order_by(Job.created_at.desc(), Job.id.desc())
+        if limit is not None or cursor:
+            try:
+                job_query, limit = keyset_page(
+                    job_query, Job.created_at, Job.id, limit, cursor)
+            except ValueError:
+                return jsonify({"error": "Invalid cursor"}), 400
+            serialized_jobs = [
+                row._asdict() for row in db.session.execute(job_query)]
+        else:
+            # Unpaginated listings are fetched in batches; if there is more
+            # than one batch, stream them instead of building the whole list.
+            # A streamed body has no ETag (it isn't hashed before sending,
+            # and edits to a job change no cheap aggregate), so clients that
+            # want 304s should walk the listing with limit/cursor pages
+            jobs_result = db.session.execute(
+                job_query.execution_options(
+                    yield_per=JOBS_STREAM_BATCH))
+            batches = jobs_result.partitions()
+            first_batch = next(batches, [])
+            if len(first_batch) == JOBS_STREAM_BATCH:
+                return Response(
+                    stream_with_context(generate_json_stream(
+                        'jobs', chain((first_batch,), batches),
+                        Row._asdict)),
+                    mimetype=app.json.mimetype), 200
+            serialized_jobs = [row._asdict() for row in first_batch]
+        response = {
             "jobs": serialized_jobs,
             "count": len(serialized_jobs)
-        }), 200
+        }
+        if limit is not None:
+            response["next_cursor"] = next_page_cursor(serialized_jobs, limit)
+        return conditional_json(response)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -535,11 +921,11 @@ def list_jobs():
 @app.route('/api/jobs/<jobId>', methods=['GET'])
 def get_job(jobId):
     try:
-        print(f"Fetching job with ID: {jobId}")
-        job = Job.query.get(jobId)
+        logger.debug("Fetching job with ID: %s", jobId)
+        job = db.session.get(Job, jobId)
         if not job:
             return jsonify({"error": "Job not found"}), 404
-        return jsonify({
+        return conditional_json({
             "id": job.id,
             "title": job.title,
             "category": job.category,
@@ -551,10 +937,10 @@ def get_job(jobId):
             "budget": job.budget,
             "deadline": job.deadline,
             "contractor_id": job.contractor_id,
-            "created_at": job.created_at.isoformat(),
+            "created_at": job.created_at,
             "status": job.status,
             "fair_price_estimate": job.fair_price_estimate
-        }), 200
+        })
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -564,19 +950,23 @@ def get_job(jobId):
 @app.route('/api/jobs/<job_id>', methods=['PUT'])
 def update_job(job_id):
     try:
-        job = Job.query.get(job_id)
+        job = db.session.get(Job, job_id)
         if not job:
             return jsonify({"error": "Job not found"}), 404
-        data = request.json
-        # Fields that cannot be updated
-        protected_fields = ['id', 'contractor_id', 'created_at']
+        data = request.get_json(silent=True)
+        error = body_error(data)
+        if error:
+            return error
+        # Snapshot the pricing inputs to detect real changes
+        old_price_inputs = [getattr(job, key) for key in FAIR_PRICE_FIELDS]
         # Update job fields
         for key, value in data.items():
-            if key not in protected_fields and hasattr(job, key):
+            if key in UPDATABLE_JOB_FIELDS:
                 setattr(job, key, value)
-        # If critical parameters changed, update fair price estimate
-        if any(key in data for key in ['category', 'location', 'area_sqm', 'complexity_score', 'material_quality_score']):
-            fair_price = analyzer.predict_fair_price(
+        # If critical parameters changed value (not merely appeared in the
+        # request), update fair price estimate
+        if any(getattr(job, key) != old for key, old in zip(FAIR_PRICE_FIELDS, old_price_inputs)):
+            fair_price = get_analyzer().predict_fair_price(
                 category=job.category,
                 location=job.location,
                 area_sqm=job.area_sqm,
@@ -600,7 +990,7 @@ def update_job(job_id):
                 "budget": job.budget,
                 "deadline": job.deadline,
                 "contractor_id": job.contractor_id,
-                "created_at": job.created_at.isoformat(),
+                "created_at": job.created_at,
                 "status": job.status,
                 "fair_price_estimate": job.fair_price_estimate
             }
@@ -615,18 +1005,17 @@ def update_job(job_id):
 @app.route('/api/submit-application', methods=['POST'])
 def submit_application():
     try:
-        data = request.json
+        data = request.get_json(silent=True)
         # Validate required fields
-        required_fields = ['job_id', 'tradesman_id']
-        for field in required_fields:
-            if field not in data:
-                return jsonify({"error": f"Missing required field: {field}"}), 400
+        error = missing_field_error(data, SUBMIT_APPLICATION_FIELDS)
+        if error:
+            return error
         # Check if job exists
-        job = Job.query.get(data['job_id'])
+        job = db.session.get(Job, data['job_id'])
         if not job:
             return jsonify({"error": "Job not found"}), 404
         # Check if tradesman exists
-        tradesman = User.query.get(data['tradesman_id'])
+        tradesman = db.session.get(User, data['tradesman_id'])
         if not tradesman or tradesman.user_type != USER_TYPE_TRADESMAN:
             return jsonify({"error": "Invalid tradesman"}), 400
         # Create application object
@@ -649,14 +1038,12 @@ def submit_application():
 @app.route('/api/send-dispute-report', methods=['POST'])
 def send_dispute_report():
     try:
-        data = request.json
+        data = request.get_json(silent=True)
 
         # Validate required fields
-        required_fields = ['phoneNumber', 'jobTitle',
-                           'jobLocation', 'issueDate', 'additionalNotes']
-        for field in required_fields:
-            if field not in data:
-                return jsonify({"error": f"Missing required field: {field}"}), 400
+        error = missing_field_error(data, SEND_DISPUTE_REPORT_FIELDS)
+        if error:
+            return error
 
         # Extract data
         phone_number = data['phoneNumber']
@@ -691,8 +1078,9 @@ def send_dispute_report():
             "text": email_body
         }
 
-        response = requests.post(
-            "https://api.resend.com/emails", json=payload, headers=headers)
+        response = http_session.post(
+            "https://api.resend.com/emails", json=payload, headers=headers,
+            timeout=HTTP_TIMEOUT)
 
         # Check if the email was sent successfully
         if response.status_code == 200:
@@ -709,24 +1097,41 @@ def send_dispute_report():
 @app.route('/api/jobs/<job_id>/applications', methods=['GET'])
 def list_job_applications(job_id):
     try:
-        job = Job.query.get(job_id)
-        if not job:
+        if not db.session.scalar(
+                select(select(Job.id).filter_by(id=job_id).exists())):
             return jsonify({"error": "Job not found"}), 404
-        # Get applications for the job
-        applications_list = Application.query.filter_by(
-            job_id=job_id).order_by(Application.created_at.desc()).all()
-        # Serialize applications
-        serialized_applications = [{
-            "id": app.id,
-            "job_id": app.job_id,
-            "tradesman_id": app.tradesman_id,
-            "created_at": app.created_at.isoformat(),
-            "status": app.status
-        } for app in applications_list]
-        return jsonify({
-            "applications": serialized_applications,
-            "count": len(serialized_applications)
-        }), 200
+        # Optional keyset pagination: pass limit, then the returned next_cursor
+        limit = request.args.get('limit', type=int)
+        cursor = request.args.get('cursor')
+        # Get applications for the job as plain column rows, newest first
+        applications_query = (
+            select(Application.id, Application.job_id, Application.tradesman_id,
+                   iso_timestamp(Application.created_at), Application.status)
+            .where(Application.job_id == job_id)
+            .order_by(Application.created_at.desc(), Application.id.desc()))
+        if limit is not None or cursor:
+            try:
+                applications_query, limit = keyset_page(
+                    applications_query, Application.created_at,
+                    Application.id, limit, cursor)
+            except ValueError:
+                return jsonify({"error": "Invalid cursor"}), 400
+            serialized_applications = [
+                row._asdict() for row in db.session.execute(applications_query)]
+            return conditional_json({
+                "applications": serialized_applications,
+                "count": len(serialized_applications),
+                "next_cursor": next_page_cursor(serialized_applications, limit)
+            })
+        # Otherwise fetch in batches so a job with many applications isn't
+        # held in memory at once
+        applications_result = db.session.execute(
+            applications_query.execution_options(
+                yield_per=APPLICATIONS_STREAM_BATCH))
+        return Response(
+            stream_with_context(generate_json_stream(
+                'applications', applications_result.partitions(), Row._asdict)),
+            mimetype=app.json.mimetype), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -736,17 +1141,11 @@ def list_job_applications(job_id):
 @app.route('/api/jobs/<job_id>/applications', methods=['POST'])
 def submit_job_application(job_id):
     try:
-        # Get job and validate it exists
-        job = Job.query.get(job_id)
-        if not job:
-            return jsonify({"error": "Job not found"}), 404
-
-        data = request.json
+        data = request.get_json(silent=True)
         # Validate required fields
-        required_fields = ['tradesman_id', 'price_quote', 'estimated_days']
-        for field in required_fields:
-            if field not in data:
-                return jsonify({"error": f"Missing required field: {field}"}), 400
+        error = missing_field_error(data, SUBMIT_JOB_APPLICATION_FIELDS)
+        if error:
+            return error
 
         # Validate data types
         if not isinstance(data['price_quote'], (int, float)) or data['price_quote'] <= 0:
@@ -755,18 +1154,25 @@ def submit_job_application(job_id):
         if not isinstance(data['estimated_days'], int) or data['estimated_days'] <= 0:
             return jsonify({"error": "Estimated days must be a positive integer"}), 400
 
-        # Check if tradesman exists
-        tradesman = User.query.get(data['tradesman_id'])
-        if not tradesman or tradesman.user_type != USER_TYPE_TRADESMAN:
-            return jsonify({"error": "Invalid tradesman"}), 400
+        # Check the job and tradesman exist and that the tradesman hasn't
+        # already applied, in a single round trip
+        job_exists, tradesman_exists, already_applied = db.session.execute(select(
+            select(Job.id).filter_by(id=job_id).exists(),
+            select(User.id).filter_by(
+                id=data['tradesman_id'],
+                user_type=USER_TYPE_TRADESMAN).exists(),
+            select(Application.id).filter_by(
+                job_id=job_id,
+                tradesman_id=data['tradesman_id']).exists(),
+        )).one()
+
+        if not job_exists:
+            return jsonify({"error": "Job not found"}), 404
 
-        # Check if tradesman has already applied for this job
-        existing_application = Application.query.filter_by(
-            job_id=job_id,
-            tradesman_id=data['tradesman_id']
-        ).first()
+        if not tradesman_exists:
+            return jsonify({"error": "Invalid tradesman"}), 400
 
-        if existing_application:
+        if already_applied:
             return jsonify({"error": "You have already applied for this job"}), 400
 
         # Create application object with additional fields
@@ -785,9 +1191,14 @@ def submit_job_application(job_id):
         if 'availability_date' in data:
             new_application.availability_date = data['availability_date']
 
-        # Save application to database
+        # Save application to database; the unique (job_id, tradesman_id)
+        # index catches a concurrent duplicate that slipped past the check
         db.session.add(new_application)
-        db.session.commit()
+        try:
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            return jsonify({"error": "You have already applied for this job"}), 400
 
         return jsonify({
             "message": "Application submitted successfully",
@@ -798,7 +1209,7 @@ def submit_job_application(job_id):
                 "tradesman_id": new_application.tradesman_id,
                 "price_quote": new_application.price_quote,
                 "estimated_days": new_application.estimated_days,
-                "created_at": new_application.created_at.isoformat(),
+                "created_at": new_application.created_at,
                 "status": new_application.status
             }
         }), 201
@@ -813,31 +1224,20 @@ def submit_job_application(job_id):
 def update_application_status(application_id):
 
     try:
-        application = Application.query.get(application_id)
+        application = db.session.get(Application, application_id)
 
         if not application:
             return jsonify({"error": "Application not found"}), 404
-        data = request.json
-
-        if 'status' not in data or data['status'] not in ['approved', 'rejected', 'closed', 'dispute']:
+        data = request.get_json(silent=True)
+        error = body_error(data)
+        if error:
+            return error
+        if 'status' not in data or data['status'] not in APPLICATION_STATUS_UPDATES:
             return jsonify({"error": "Invalid status. Must be 'accepted' or 'rejected'"}), 400
         # Update application status
         application.status = data['status']
-        logging.info(f"application.status ===>>: {application.status}")
-
-        # If accepting application, update job status and handle other applications
-        # if data['status'] == 'accepted':
-        #     job = Job.query.get(application.job_id)
-        #     if job:
-        #         job.status = 'assigned'
-        #         # Reject all other pending applications for this job
-        #         pending_apps = Application.query.filter_by(
-        #             job_id=job.id, status='applied').all()
-        #         for app in pending_apps:
-        #             app.status = 'rejected'
-
-        # if data['status'] == 'accepted':
-        #     pending_apps = Application.query.filter_by(id=)
+        logger.debug("application %s status -> %s",
+                     application.id, application.status)
 
         # Save changes
         db.session.commit()
@@ -847,7 +1247,7 @@ def update_application_status(application_id):
                 "id": application.id,
                 "job_id": application.job_id,
                 "tradesman_id": application.tradesman_id,
-                "created_at": application.created_at.isoformat(),
+                "created_at": application.created_at,
                 "status": application.status
             }
         }), 200
@@ -861,36 +1261,186 @@ def update_application_status(application_id):
 @app.route('/api/tradesman/<tradesman_id>/applications', methods=['GET'])
 def list_tradesman_applications(tradesman_id):
     try:
-        # Get applications submitted by the tradesman
-        applications_list = Application.query.filter_by(
-            tradesman_id=tradesman_id).order_by(Application.created_at.desc()).all()
-        # Serialize applications
-        serialized_applications = []
-        for app in applications_list:
-            job = Job.query.get(app.job_id)
-            serialized_applications.append({
-                "id": app.id,
-                "job_id": app.job_id,
-                "tradesman_id": app.tradesman_id,
-                "created_at": app.created_at.isoformat(),
-                "status": app.status,
+        # Optional keyset pagination: pass limit, then the returned next_cursor
+        limit = request.args.get('limit', type=int)
+        cursor = request.args.get('cursor')
+        # Get applications submitted by the tradesman, newest first, with
+        # their job's summary columns from the same query (LEFT JOIN)
+        applications_query = (
+            select(Application.id, Application.job_id, Application.tradesman_id,
+                   iso_timestamp(Application.created_at), Application.status,
+                   Job.id.label('job_found'), Job.title, Job.category,
+                   Job.location, Job.status.label('job_status'))
+            .outerjoin(Job, Application.job_id == Job.id)
+            .where(Application.tradesman_id == tradesman_id)
+            .order_by(Application.created_at.desc(), Application.id.desc()))
+
+        def serialize(row):
+            return {
+                "id": row.id,
+                "job_id": row.job_id,
+                "tradesman_id": row.tradesman_id,
+                "created_at": row.created_at,
+                "status": row.status,
                 "job_details": {
-                    "title": job.title,
-                    "category": job.category,
-                    "location": job.location,
-                    "status": job.status
-                } if job else None
+                    "title": row.title,
+                    "category": row.category,
+                    "location": row.location,
+                    "status": row.job_status
+                } if row.job_found is not None else None
+            }
+
+        if limit is not None or cursor:
+            try:
+                applications_query, limit = keyset_page(
+                    applications_query, Application.created_at,
+                    Application.id, limit, cursor)
+            except ValueError:
+                return jsonify({"error": "Invalid cursor"}), 400
+            serialized_applications = [
+                serialize(row) for row in db.session.execute(applications_query)]
+            return conditional_json({
+                "applications": serialized_applications,
+                "count": len(serialized_applications),
+                "next_cursor": next_page_cursor(serialized_applications, limit)
             })
-        return jsonify({
-            "applications": serialized_applications,
-            "count": len(serialized_applications)
-        }), 200
+        # Otherwise fetch in batches so a long history isn't held in memory
+        # at once
+        applications_result = db.session.execute(
+            applications_query.execution_options(
+                yield_per=APPLICATIONS_STREAM_BATCH))
+        return Response(
+            stream_with_context(generate_json_stream(
+                'applications', applications_result.partitions(), serialize)),
+            mimetype=app.json.mimetype), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
-# Run the app
+# Columns holding ids that earlier versions wrote as 36-character text
+UUID_COLUMNS = {
+    'user': ('id',),
+    'job': ('id', 'contractor_id'),
+    'application': ('id', 'job_id', 'tradesman_id'),
+}
+
+# Namespace for the UUIDs that replace legacy ids which weren't UUIDs
+LEGACY_ID_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_OID, 'construction_platform.legacy_id')
+
+
+def legacy_id_uuid(value):
+    # The same text always maps to the same UUID, so primary keys and the
+    # foreign keys pointing at them stay matched without a lookup table
+    parsed = parse_uuid(value)
+    return parsed if parsed is not None else uuid.uuid5(LEGACY_ID_NAMESPACE, value)
+
+
+# Convert ids written as text by earlier versions to the 16-byte form
+# UUIDBytes binds, so existing rows keep matching their lookups. Text that
+# isn't a UUID (e.g. a hand-written 'test' id) gets a derived UUID; returns
+# {old text: new id} for those.
+def migrate_text_uuids():
+    renamed = {}
+    with db.engine.begin() as conn:
+        for table, columns in UUID_COLUMNS.items():
+            for column in columns:
+                rows = conn.exec_driver_sql(
+                    f"SELECT DISTINCT {column} FROM {table} "
+                    f"WHERE typeof({column}) = 'text'").fetchall()
+                updates = []
+                for (value,) in rows:
+                    new_id = legacy_id_uuid(value)
+                    if parse_uuid(value) is None:
+                        renamed[value] = str(new_id)
+                    updates.append((new_id.bytes, value))
+                if updates:
+                    conn.exec_driver_sql(
+                        f"UPDATE {table} SET {column} = ? WHERE {column} = ?",
+                        updates)
+    return renamed
+
+
+def text_ids_remaining():
+    # Whether any table still has a text primary key, i.e. migrate-db hasn't
+    # been run on this database
+    probe = " OR ".join(
+        f"EXISTS (SELECT 1 FROM {table} WHERE typeof(id) = 'text')"
+        for table in UUID_COLUMNS)
+    with db.engine.connect() as conn:
+        return bool(conn.exec_driver_sql(f"SELECT {probe}").scalar())
+
+
+# ix_application_job_tradesman is unique, so before it can be built on an
+# older database, keep one application per (job, tradesman): one that has
+# been acted on in preference to a fresh ('pending'/'applied') one, else the
+# earliest
+def dedupe_applications():
+    with db.engine.begin() as conn:
+        return conn.exec_driver_sql(
+            "DELETE FROM application WHERE rowid IN ("
+            " SELECT rowid FROM (SELECT rowid, ROW_NUMBER() OVER ("
+            "  PARTITION BY job_id, tradesman_id"
+            "  ORDER BY status IN ('pending', 'applied'), created_at, rowid)"
+            "  AS n"
+            "  FROM application) WHERE n > 1)").rowcount
+
+
+# Indexes earlier versions created that the models no longer declare
+REPLACED_INDEXES = (
+    'ix_job_status_created',
+    'ix_job_category_location_status_created',
+    'ix_application_job_created',
+    'ix_application_tradesman_created',
+    'ix_application_job_status',
+)
+
+
+# Create database tables (also runs in each WSGI worker on import). Changes
+# to databases created by an earlier version are applied by migrate-db below.
+with app.app_context():
+    db.create_all()
+    # Text ids never match the 16-byte ids lookups bind, so those rows would
+    # answer 404 until the database is migrated
+    if text_ids_remaining():
+        logger.error("Database has ids stored as text by an earlier version; "
+                     "lookups of those rows fail until `flask --app api "
+                     "migrate-db` is run")
+
+
+@app.cli.command('migrate-db')
+def migrate_db():
+    """Upgrade an existing database to the current schema.
+
+    Run once before deploying (flask --app api migrate-db), never from the
+    workers: it rewrites key columns and builds indexes.
+    """
+    db.create_all()
+    for old_id, new_id in migrate_text_uuids().items():
+        click.echo(f"Legacy id {old_id!r} is now {new_id}")
+    removed = dedupe_applications()
+    if removed:
+        click.echo(f"Removed {removed} duplicate applications")
+    with db.engine.begin() as conn:
+        for name in REPLACED_INDEXES:
+            conn.exec_driver_sql(f"DROP INDEX IF EXISTS {name}")
+    # create_all() skips indexes on tables that already exist, so add any
+    # missing ones to databases created before they were declared
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(db.engine, checkfirst=True)
+    click.echo("Database is up to date")
+
+
+@app.cli.command('train-model')
+def train_model():
+    """Train the price model once and save it to MODEL_PATH for the workers."""
+    analyzer = PriceAnalyzer()
+    analyzer.save_model(MODEL_PATH)
+    click.echo(f"Saved price model to {MODEL_PATH}")
+
+
+# Run the development server; in production serve with gunicorn (see gunicorn.conf.py):
+#   gunicorn api:app
 if __name__ == "__main__":
-    with app.app_context():
-        db.create_all()  # Create database tables
-    app.run(debug=True)
+    get_analyzer().warm_up()
+    app.run(debug=os.environ.get('FLASK_DEBUG') == '1')
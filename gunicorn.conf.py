@@ -0,0 +1,34 @@
+# Gunicorn settings for serving the API:
+#   flask --app api migrate-db   (once per deploy, before starting workers)
+#   flask --app api train-model  (once per deploy, or ship the MODEL_PATH files)
+#   gunicorn api:app
+import multiprocessing
+import os
+
+bind = os.environ.get('BIND', '0.0.0.0:5000')
+
+# One process per core so model inference runs in parallel
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count()))
+
+# Threads rather than gevent by default: bcrypt, SQLite and the Numba/NumPy
+# inference all release the GIL, so they overlap across threads, whereas under
+# gevent they would block the event loop. An async worker class can still be
+# selected (with worker_connections) if the outbound I/O grows.
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+worker_connections = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', 1000))
+
+# TensorFlow is not fork-safe: don't import the app (and the model) in the
+# master, let every worker load its own PriceAnalyzer from MODEL_PATH
+preload_app = False
+
+# A worker only starts heartbeating after post_worker_init, so loading and
+# warming up the model must finish within this many seconds
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120))
+
+
+def post_worker_init(worker):
+    # Load and warm up this worker's model before it accepts requests, so the
+    # first user doesn't pay for loading and the first inference
+    import api
+    api.get_analyzer().warm_up()
@@ -0,0 +1,101 @@
+"""Shared fixtures: the API on a scratch SQLite database, with the price model
+stubbed so tests don't train TensorFlow, plus SQL statement counting."""
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+
+# Configure the app before it is imported: a throwaway database instead of
+# instance/construction_platform.db, and the cheapest bcrypt cost
+os.environ['API_DATABASE_URL'] = 'sqlite:///' + os.path.join(
+    tempfile.mkdtemp(), 'test.db')
+os.environ.setdefault('BCRYPT_ROUNDS', '4')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import api  # noqa: E402
+
+
+class StubAnalyzer:
+    """Stands in for PriceAnalyzer in endpoint tests"""
+
+    def predict_fair_price(self, category, location, area_sqm, complexity_score,
+                           material_quality_score):
+        return 1000.0
+
+
+@contextmanager
+def count_queries(engine):
+    """Collect the SQL statements the engine executes inside the block"""
+    queries = []
+
+    def record(conn, cursor, statement, *args):
+        queries.append(statement)
+
+    event.listen(engine, 'before_cursor_execute', record)
+    try:
+        yield queries
+    finally:
+        event.remove(engine, 'before_cursor_execute', record)
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(api, '_analyzer', StubAnalyzer())
+    with api.app.app_context():
+        api.db.drop_all()
+        api.db.create_all()
+    return api.app.test_client()
+
+
+@pytest.fixture
+def assert_max_queries():
+    """with assert_max_queries(n): fails if the block issues more than n statements"""
+    with api.app.app_context():
+        engine = api.db.engine
+
+    @contextmanager
+    def check(max_queries):
+        with count_queries(engine) as queries:
+            yield queries
+        assert len(queries) <= max_queries, (
+            f"{len(queries)} SQL statements (budget {max_queries}):\n" +
+            "\n".join(queries))
+
+    return check
+
+
+def register(client, username, user_type):
+    client.post('/api/register', json={
+        'username': username, 'password': 'pw', 'user_type': user_type})
+    return client.post('/api/login', json={
+        'username': username, 'password': 'pw'}).get_json()['user_id']
+
+
+def create_job(client, contractor_id, **fields):
+    job = dict(title='Wall', category='Masonry', location='Kandy',
+               description='Build a wall', area_sqm=50, complexity_score=5,
+               material_quality_score=5, budget=1000, deadline='2026-12-01',
+               contractor_id=contractor_id)
+    job.update(fields)
+    return client.post('/api/create-job', json=job).get_json()['job_id']
+
+
+def apply(client, job_id, tradesman_id):
+    return client.post(f'/api/jobs/{job_id}/applications', json={
+        'tradesman_id': tradesman_id, 'price_quote': 900, 'estimated_days': 3})
+
+
+@pytest.fixture
+def seeded(client):
+    """A contractor with three jobs and two tradesmen who applied to each"""
+    contractor = register(client, 'contractor', api.USER_TYPE_CONTRACTOR)
+    tradesmen = [register(client, f'tradesman{i}', api.USER_TYPE_TRADESMAN)
+                 for i in range(2)]
+    jobs = [create_job(client, contractor, title=f'Job {i}') for i in range(3)]
+    for job_id in jobs:
+        for tradesman_id in tradesmen:
+            apply(client, job_id, tradesman_id)
+    return {'contractor': contractor, 'tradesmen': tradesmen, 'jobs': jobs}
@@ -0,0 +1,44 @@
+"""Login: bcrypt cost upgrades on login, never downgrades"""
+import bcrypt
+
+import api
+
+
+def add_user(username, rounds):
+    password = bcrypt.hashpw(b'pw', bcrypt.gensalt(rounds=rounds)).decode('utf-8')
+    with api.app.app_context():
+        api.db.session.add(api.User(username=username, password=password,
+                                    user_type=api.USER_TYPE_CONTRACTOR))
+        api.db.session.commit()
+
+
+def stored_cost(username):
+    with api.app.app_context():
+        user = api.db.session.scalar(api.select(api.User).filter_by(username=username))
+        return int(user.password.split('$')[2])
+
+
+def login(client, username, password='pw'):
+    return client.post('/api/login', json={'username': username, 'password': password})
+
+
+def test_weaker_hash_is_upgraded_on_login(client, monkeypatch):
+    monkeypatch.setattr(api, 'BCRYPT_ROUNDS', 5)
+    add_user('old', rounds=4)
+    assert login(client, 'old').status_code == 200
+    assert stored_cost('old') == 5
+
+
+def test_stronger_hash_is_kept_on_login(client, monkeypatch):
+    monkeypatch.setattr(api, 'BCRYPT_ROUNDS', 4)
+    add_user('strong', rounds=6)
+    assert login(client, 'strong').status_code == 200
+    assert stored_cost('strong') == 6
+
+
+def test_failed_logins_look_the_same(client):
+    add_user('someone', rounds=4)
+    wrong_password = login(client, 'someone', password='nope')
+    unknown_user = login(client, 'nobody')
+    assert wrong_password.status_code == unknown_user.status_code == 401
+    assert wrong_password.get_json() == unknown_user.get_json()
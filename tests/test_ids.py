@@ -0,0 +1,83 @@
+"""UUID primary/foreign keys: storage format, validation and the text migration"""
+import uuid
+
+import api
+from conftest import apply, create_job, register
+
+
+def raw(sql):
+    with api.app.app_context(), api.db.engine.connect() as conn:
+        return conn.exec_driver_sql(sql).fetchall()
+
+
+def test_new_ids_are_uuid7_stored_as_16_bytes(client):
+    user_id = register(client, 'contractor', api.USER_TYPE_CONTRACTOR)
+    assert uuid.UUID(user_id).version == 7
+    assert raw("SELECT typeof(id), length(id) FROM user") == [('blob', 16)]
+
+
+def test_non_uuid_ids_in_bodies_are_rejected(client):
+    contractor = register(client, 'contractor', api.USER_TYPE_CONTRACTOR)
+    job_id = create_job(client, contractor)
+    response = apply(client, job_id, 5)
+    assert response.status_code == 400
+    response = client.post('/api/submit-application', json={
+        'job_id': 123, 'tradesman_id': 'abcdefghijklmnop'})
+    assert response.status_code == 400
+    response = client.post('/api/create-job', json={
+        'title': 't', 'category': 'Masonry', 'location': 'Kandy',
+        'description': 'd', 'area_sqm': 1, 'complexity_score': 1,
+        'material_quality_score': 1, 'budget': 1, 'deadline': 'x',
+        'contractor_id': 'not-a-uuid'})
+    assert response.status_code == 400
+
+
+def test_non_uuid_ids_in_urls_are_not_found(client):
+    # 16 characters, the length a raw UUID blob has
+    assert client.get('/api/jobs/abcdefghijklmnop').status_code == 404
+    assert client.get('/api/jobs/nope').status_code == 404
+
+
+def test_migrate_text_uuids(client):
+    user_id = str(uuid.uuid4())
+    with api.app.app_context(), api.db.engine.begin() as conn:
+        conn.exec_driver_sql(
+            "INSERT INTO user (id, username, password, user_type) "
+            "VALUES (?, 'legacy', 'x', 'contractor')", (user_id,))
+        conn.exec_driver_sql(
+            "INSERT INTO user (id, username, password, user_type) "
+            "VALUES ('test', 'handmade', 'x', 'contractor')")
+        conn.exec_driver_sql(
+            "INSERT INTO job (id, title, category, location, description, "
+            "area_sqm, complexity_score, material_quality_score, budget, "
+            "deadline, contractor_id, fair_price_estimate) VALUES "
+            "(?, 't', 'c', 'l', 'd', 1, 1, 1, 1, 'x', 'test', 1)",
+            (str(uuid.uuid4()),))
+    with api.app.app_context():
+        assert api.text_ids_remaining()
+        renamed = api.migrate_text_uuids()
+        assert not api.text_ids_remaining()
+    assert raw("SELECT typeof(id) FROM user") == [('blob',), ('blob',)]
+    assert client.get(f'/api/contractors/{user_id}/tasks').status_code == 200
+    # The non-UUID id and the job pointing at it get the same derived UUID
+    tasks = client.get(f"/api/contractors/{renamed['test']}/tasks").get_json()
+    assert len(tasks['tasks']) == 1
+
+
+def test_dedupe_applications_keeps_the_acted_on_one(client):
+    contractor = register(client, 'contractor', api.USER_TYPE_CONTRACTOR)
+    tradesman = register(client, 'tradesman', api.USER_TYPE_TRADESMAN)
+    job_id = create_job(client, contractor)
+    application_id = apply(client, job_id, tradesman).get_json()['application_id']
+    client.put(f'/api/applications/{application_id}',
+               json={'status': 'approved'})
+    with api.app.app_context(), api.db.engine.begin() as conn:
+        conn.exec_driver_sql("DROP INDEX ix_application_job_tradesman")
+        conn.exec_driver_sql(
+            "INSERT INTO application (id, job_id, tradesman_id, price_quote, "
+            "estimated_days, created_at, status) SELECT ?, job_id, "
+            "tradesman_id, price_quote, estimated_days, created_at, 'pending' "
+            "FROM application", (uuid.uuid4().bytes,))
+    with api.app.app_context():
+        assert api.dedupe_applications() == 1
+    assert raw("SELECT status FROM application") == [('approved',)]
@@ -0,0 +1,77 @@
+"""Keyset pagination and streamed listings"""
+import json
+
+import api
+from conftest import apply, create_job, register
+
+
+def walk(client, url, key):
+    """Follow next_cursor from the first page to the last, collecting ids"""
+    ids, cursor = [], None
+    while True:
+        params = {'limit': 3}
+        if cursor:
+            params['cursor'] = cursor
+        body = client.get(url, query_string=params).get_json()
+        ids.extend(row['id'] for row in body[key])
+        cursor = body['next_cursor']
+        if cursor is None:
+            return ids
+
+
+def test_job_pages_cover_the_full_listing_in_order(client):
+    contractor = register(client, 'contractor', api.USER_TYPE_CONTRACTOR)
+    for i in range(7):
+        create_job(client, contractor, title=f'Job {i}')
+    full = [job['id'] for job in client.get('/api/jobs').get_json()['jobs']]
+    assert len(full) == 7
+    assert walk(client, '/api/jobs', 'jobs') == full
+
+
+def test_application_pages_cover_the_full_listing_in_order(client):
+    contractor = register(client, 'contractor', api.USER_TYPE_CONTRACTOR)
+    job_id = create_job(client, contractor)
+    for i in range(5):
+        apply(client, job_id, register(client, f't{i}', api.USER_TYPE_TRADESMAN))
+    url = f'/api/jobs/{job_id}/applications'
+    full = [row['id'] for row in client.get(url).get_json()['applications']]
+    assert len(full) == 5
+    assert walk(client, url, 'applications') == full
+
+
+def test_malformed_cursor_is_rejected(client):
+    for cursor in ('garbage', '2026-01-01T00:00:00|not-a-uuid'):
+        response = client.get('/api/jobs', query_string={'cursor': cursor})
+        assert response.status_code == 400
+
+
+def test_large_job_listing_is_streamed(client, monkeypatch):
+    monkeypatch.setattr(api, 'JOBS_STREAM_BATCH', 2)
+    contractor = register(client, 'contractor', api.USER_TYPE_CONTRACTOR)
+    for i in range(5):
+        create_job(client, contractor, title=f'Job {i}')
+    response = client.get('/api/jobs')
+    assert response.is_streamed
+    body = json.loads(response.data)
+    assert body['count'] == 5
+    assert len({job['id'] for job in body['jobs']}) == 5
+
+
+def test_stream_failure_still_returns_valid_json(client, monkeypatch):
+    monkeypatch.setattr(api, 'JOBS_STREAM_BATCH', 2)
+    contractor = register(client, 'contractor', api.USER_TYPE_CONTRACTOR)
+    for i in range(5):
+        create_job(client, contractor, title=f'Job {i}')
+    dumps = api.app.json.dumps
+    calls = []
+
+    def failing_dumps(obj, **kwargs):
+        calls.append(obj)
+        if len(calls) == 2:
+            raise RuntimeError('serialization failed')
+        return dumps(obj, **kwargs)
+
+    monkeypatch.setattr(api.app.json, 'dumps', failing_dumps)
+    body = json.loads(client.get('/api/jobs').data)
+    assert body['count'] == 2
+    assert 'error' in body
@@ -0,0 +1,66 @@
+"""PriceAnalyzer inference paths: folded MLP weights, batch prediction, save/load"""
+
+import numpy as np
+import pytest
+import tensorflow as tf
+
+from PriceAnalyzer import PriceAnalyzer, _mlp_forward_kernel
+
+
+@pytest.fixture(scope='module')
+def analyzer():
+    # Trains once on synthetic data (a few seconds) and is shared by the module
+    return PriceAnalyzer()
+
+
+@pytest.fixture(scope='module')
+def jobs(analyzer):
+    data = analyzer.generate_training_data(size=200)
+    data['category'] = data['category'].astype(object)
+    data['location'] = data['location'].astype(object)
+    # Off-grid values, so rounding is exercised, and unknown labels
+    data['area_sqm'] += 0.0437
+    data.loc[0, 'category'] = 'Unknown category'
+    data.loc[1, 'location'] = 'Unknown location'
+    return data
+
+
+def test_folded_mlp_matches_the_keras_model(analyzer, jobs):
+    X = analyzer._prepare_features(jobs.iloc[2:])
+    folded = _mlp_forward_kernel(X, *analyzer._mlp_params).ravel()
+    X_scaled = (X - analyzer._scale_mean) * analyzer._scale_inv_std
+    keras = analyzer.model(tf.constant(X_scaled), training=False).numpy().ravel()
+    np.testing.assert_allclose(folded, keras, rtol=1e-3, atol=0.5)
+
+
+def test_batch_prediction_matches_single_rows(analyzer, jobs):
+    batch = analyzer.predict_fair_prices(jobs)
+    single = [analyzer.predict_fair_price(
+        row.category, row.location, row.area_sqm, row.complexity_score,
+        row.material_quality_score) for row in jobs.itertuples()]
+    np.testing.assert_allclose(batch, single, atol=0.01)
+
+
+def test_save_and_load_round_trip(analyzer, jobs, tmp_path):
+    model_path = str(tmp_path / 'model.keras')
+    analyzer.save_model(model_path)
+    loaded = PriceAnalyzer(model_path=model_path)
+    assert loaded._mlp_params is not None
+    # The TFLite fallback is only exported when it would be used
+    assert not (tmp_path / 'model.tflite').exists()
+    np.testing.assert_allclose(
+        loaded.predict_fair_prices(jobs), analyzer.predict_fair_prices(jobs),
+        rtol=1e-6)
+
+
+def test_save_without_folded_weights_removes_stale_file(analyzer, tmp_path,
+                                                       monkeypatch):
+    model_path = str(tmp_path / 'model.keras')
+    analyzer.save_model(model_path)
+    mlp_path = tmp_path / 'mlp_weights.npz'
+    assert mlp_path.exists()
+    monkeypatch.setattr(analyzer, '_mlp_params', None)
+    analyzer.save_model(model_path)
+    assert not mlp_path.exists()
+    assert (tmp_path / 'model.tflite').exists()
+    assert PriceAnalyzer(model_path=model_path)._mlp_params is None
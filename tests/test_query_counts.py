@@ -0,0 +1,37 @@
+"""SQL statement budgets per endpoint, so N+1 query regressions fail here"""
+
+
+def test_list_tradesman_applications(client, seeded, assert_max_queries):
+    tradesman_id = seeded['tradesmen'][0]
+    with assert_max_queries(1):
+        body = client.get(f'/api/tradesman/{tradesman_id}/applications').get_json()
+    assert body['count'] == 3
+    assert all(app['job_details'] for app in body['applications'])
+
+
+def test_get_contractor_tasks(client, seeded, assert_max_queries):
+    with assert_max_queries(3):
+        body = client.get(
+            f"/api/contractors/{seeded['contractor']}/tasks").get_json()
+    assert len(body['tasks']) == 3
+    assert all('application_id' in task for task in body['tasks'])
+
+
+def test_get_tradesman_tasks(client, seeded, assert_max_queries):
+    tradesman_id = seeded['tradesmen'][1]
+    with assert_max_queries(2):
+        body = client.get(f'/api/tradesman/{tradesman_id}/tasks').get_json()
+    assert len(body['tasks']) == 3
+
+
+def test_list_jobs(client, seeded, assert_max_queries):
+    with assert_max_queries(1):
+        body = client.get('/api/jobs').get_json()
+    assert body['count'] == 3
+
+
+def test_list_job_applications(client, seeded, assert_max_queries):
+    job_id = seeded['jobs'][0]
+    with assert_max_queries(2):
+        body = client.get(f'/api/jobs/{job_id}/applications').get_json()
+    assert body['count'] == 2